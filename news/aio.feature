@@ -0,0 +1,3 @@
+Added `pokemaster.aio`, with async counterparts of `Pokemon` and the
+query helpers. Database work runs on a bounded thread pool, which
+`pokemaster.aio.configure()` sizes.
@@ -0,0 +1,4 @@
+Added memory-mapped data packs of the static pokedex data.
+Export one with the `pokemaster-datapack` command, and serve the
+query helpers from it with `_database.load_datapack()`. Processes
+reading the same pack share one copy of it.
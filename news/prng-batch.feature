@@ -0,0 +1,3 @@
+Added `PRNG.next_seeds()` and `PRNG.next_array()`, which generate many
+random numbers at once as NumPy arrays, matching the scalar stream.
+Requires NumPy, installable with the `numpy` extra.
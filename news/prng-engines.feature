@@ -0,0 +1,3 @@
+Added the PRNG engines of more generations: `PRNG(gen=4)`, the 64-bit
+generator of generation 5 as `PRNG64`, and `MersenneTwister`. Pick one
+with `prng.for_generation()`.
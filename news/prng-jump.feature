@@ -0,0 +1,3 @@
+Added `PRNG.advance()`, `PRNG.rewind()` and `PRNG.distance()`, which
+jump the generator forward or backward by any number of steps in
+O(log n) time.
@@ -0,0 +1,3 @@
+Drawing single random numbers from `PRNG` no longer allocates a
+generator per call, which makes it several times faster. An
+unsupported generation now raises `ValueError`.
@@ -0,0 +1,4 @@
+Added `PRNG.substream()`, `PRNG.split()` and `PRNGFactory`, which hand
+out disjoint blocks of the random stream, so parallel work is
+reproducible whatever the number of workers. `Pokemon` takes an
+optional `prng` to draw from.
@@ -0,0 +1,4 @@
+An empty SQLite pokedex database is now built much faster, by bulk
+loading the CSV files or by copying the prebuilt database named by the
+`POKEMASTER_PREBUILT_DB` environment variable. Processes starting at
+once build it only once.
@@ -0,0 +1,4 @@
+Added `pokemaster.search`, to find the seeds and frames that generate
+Pokémon meeting given criteria on the nature, IVs, ability, or
+shininess, over many processes, and to recover the seeds of a spread
+of IVs. Requires NumPy.
@@ -0,0 +1,5 @@
+Added an in-memory snapshot of the static pokedex data.
+After `_database.load_snapshot()`, the query helpers answer from
+memory instead of querying the database, which makes creating
+Pokémon much faster. `_database.drop_snapshot()` goes back to the
+database.
@@ -0,0 +1,6 @@
+`Stats` is now an immutable `namedtuple` instead of an attrs class, and
+`Stats.make_permanent_stats()` computes a Pokémon's stats in one pass.
+This breaks code relying on attrs: use `stats._asdict()`,
+`stats._replace()` and `Stats._fields` instead of `attr.asdict()`,
+`attr.evolve()` and `attr.fields()`. `Stats` also compares equal to a
+tuple of the same six numbers.
@@ -1,5 +1,6 @@
 """Public APIs."""
 from .__version__ import __version__
+from ._database import connect
 from .pokemon import Pokemon
 from .weather import Weather
 from .game_version import Game
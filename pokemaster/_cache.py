@@ -0,0 +1,104 @@
+"""A size-bounded LRU cache with hit/miss statistics."""
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Hashable
+
+CacheInfo = namedtuple(
+    'CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize')
+)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """A thread-safe mapping that evicts its least recently used
+    entries once it holds more than ``maxsize`` of them.
+
+    Usage::
+
+        >>> cache = LRUCache(maxsize=1)
+        >>> cache.put('a', 1)
+        >>> cache.get('a')
+        1
+        >>> cache.put('b', 2)
+        >>> cache.get('a', None) is None
+        True
+        >>> cache.info()
+        CacheInfo(hits=1, misses=1, evictions=1, maxsize=1, currsize=1)
+    """
+
+    __slots__ = ('_data', '_lock', '_maxsize', 'hits', 'misses', 'evictions')
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 0:
+            raise ValueError(f'`maxsize` must be non-negative, got {maxsize}.')
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of entries. 0 disables the cache."""
+        return self._maxsize
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Get the value of ``key`` and mark it as recently used.
+
+        :raise KeyError: if ``key`` is not cached and no default is
+            given.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                if default is _MISSING:
+                    raise
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache ``value`` under ``key``, evicting the least recently
+        used entries if the cache is full."""
+        if not self._maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum size, evicting entries as needed."""
+        if maxsize < 0:
+            raise ValueError(f'`maxsize` must be non-negative, got {maxsize}.')
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop all entries. The statistics are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss, and eviction counters."""
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """The cache statistics."""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self._maxsize, len(self)
+        )
+
+    def _evict(self) -> None:
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -4,55 +4,560 @@ Make simple queries in a breeze anywhere, any time. Note that tables
 should not be passed as arguments! That'll defeat the purpose of this
 module.
 """
+import contextlib
+import functools
+import os
+import sqlite3
+import threading
+import urllib.parse
 import warnings
-from typing import List, Optional, Tuple
+import weakref
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import pokedex
 import pokedex.db
-import pokedex.db.load
 import pokedex.defaults
+import sqlalchemy.engine.url
+import sqlalchemy.event
 import sqlalchemy.exc
+import sqlalchemy.ext.baked
+import sqlalchemy.orm
 import sqlalchemy.orm.session
+import sqlalchemy.pool
+from sqlalchemy import bindparam
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from sqlalchemy.orm.exc import NoResultFound
 
+from pokemaster import _instrument, _provision, natures
+from pokemaster._cache import CacheInfo, LRUCache
+from pokemaster._datapack import DataPack, write_datapack
+from pokemaster._instrument import Collector, QueryStats, instrumented
+from pokemaster._snapshot import (
+    MOVE_GENERATION,
+    Experience,
+    ExperienceCurve,
+    Learnset,
+    Move,
+    Nature,
+    PokemonMove,
+    Snapshot,
+    SpeciesStats,
+    build_learnsets,
+    load_experience_curves,
+    load_species_stats,
+)
 from pokemaster.prng import PRNG
 
 
-def get_session(database_uri: str = None) -> sqlalchemy.orm.session.Session:
+#: Pragmas of read-only SQLite connections: no writes, the file mapped
+#: into memory (shared by all processes), and a 64 MiB page cache.
+READ_ONLY_PRAGMAS = (
+    'PRAGMA query_only = ON',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -65536',
+)
+
+
+def _read_only_creator(path: str) -> Callable[[], sqlite3.Connection]:
+    """Make a connection factory opening ``path`` read-only.
+
+    The file is opened as immutable, so SQLite takes no locks at all:
+    it must not be written to while connected.
+    """
+    uri = 'file:{}?mode=ro&immutable=1'.format(
+        urllib.parse.quote(os.path.abspath(path))
+    )
+
+    def creator() -> sqlite3.Connection:
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        for pragma in READ_ONLY_PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    return creator
+
+
+def _engine_args(database_uri: str, read_only: bool = False) -> dict:
+    """Engine options for sharing connections between threads.
+
+    File-based SQLite databases get a ``QueuePool`` instead of the
+    default ``NullPool``, and their connections are allowed to move
+    between threads (each connection is still used by one thread at a
+    time). Each thread's session keeps a connection checked out until
+    it is closed, so the pool has no overflow limit: any number of
+    threads can query at once. Other databases are pooled by
+    SQLAlchemy already.
+    """
+    path = _provision.sqlite_path(database_uri)
+    if path is None:
+        return {}
+    args = {
+        'poolclass': sqlalchemy.pool.QueuePool,
+        'max_overflow': -1,
+        'connect_args': {'check_same_thread': False},
+    }
+    if read_only:
+        args['creator'] = _read_only_creator(path)
+    return args
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    connection_record.info['pid'] = os.getpid()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    """Never hand out a connection inherited from the parent process."""
+    # Connections opened before the listeners were added belong to us.
+    pid = connection_record.info.setdefault('pid', os.getpid())
+    if pid != os.getpid():
+        # Drop it without closing it, as the parent may still use it.
+        connection_record.connection = connection_proxy.connection = None
+        raise sqlalchemy.exc.DisconnectionError(
+            'Connection opened by another process.'
+        )
+
+
+def _connect(
+    database_uri: str, read_only: bool = False
+) -> sqlalchemy.orm.scoped_session:
+    """Connect to a database through a thread-local session
+    registry."""
+    session = pokedex.db.connect(
+        database_uri, engine_args=_engine_args(database_uri, read_only)
+    )
+    if not isinstance(session, sqlalchemy.orm.scoped_session):
+        session = sqlalchemy.orm.scoped_session(
+            sqlalchemy.orm.sessionmaker(bind=session.bind)
+        )
+    sqlalchemy.event.listen(session.bind, 'connect', _on_connect)
+    sqlalchemy.event.listen(session.bind, 'checkout', _on_checkout)
+    return session
+
+
+def get_session(
+    database_uri: str = None, read_only: bool = False
+) -> sqlalchemy.orm.scoped_session:
     """Connect to a database with the given ``engine_uri``.
 
+    The returned session is a ``scoped_session``: each thread using it
+    gets its own ``Session``, backed by a shared connection pool.
+    Connections are never shared with forked processes: a child
+    process opens its own.
+
     :param database_uri: The uri of the database. The default uri set by
         :mod:`pokedex.defaults` will be used if not specified.
-    :return: A ``sqlalchemy.orm.session.Session``.
+    :param read_only: Open a SQLite database file read-only, for many
+        processes reading it at once. See ``READ_ONLY_PRAGMAS``. The
+        file must not change while connected. Ignored for other
+        databases.
+    :return: A ``sqlalchemy.orm.scoped_session``.
     """
 
     database_uri = database_uri or pokedex.defaults.get_default_db_uri()
+    if read_only and _provision.sqlite_path(database_uri) is not None:
+        # A read-only connection cannot initialize the database.
+        _provision.provision(database_uri)
 
     try:
-        session = pokedex.db.connect(database_uri)
+        session = _connect(database_uri, read_only)
     except sqlalchemy.exc.OperationalError:
         warnings.warn(f'Wrong database uri: {database_uri}.')
         warnings.warn(
             'Connecting to the default database: '
             f'{pokedex.defaults.get_default_db_uri()}.'
         )
-        session = pokedex.db.connect(pokedex.defaults.get_default_db_uri())
+        session = _connect(pokedex.defaults.get_default_db_uri(), read_only)
 
     if not pokedex.db.tables.Pokemon.__table__.exists(session.bind):
         # Empty database
         warnings.warn('Initializing database')
-        pokedex.db.load.load(session, drop_tables=True, safe=False)
-        session = pokedex.db.connect(database_uri)
+        database_uri = str(session.bind.url)
+        if _provision.sqlite_path(database_uri) is not None:
+            session.bind.dispose()
+            _provision.provision(database_uri)
+        else:
+            # Only needed on the first run, so keep it off the import
+            # path.
+            from pokedex.db.load import load
+
+            load(session, drop_tables=True, safe=False)
+        session = _connect(database_uri, read_only)
 
     return session
 
 
-SESSION = get_session()
+#: The bound session. It is created on first use, or by ``connect()``.
+SESSION: Optional[sqlalchemy.orm.session.Session] = None
+_SESSION_LOCK = threading.Lock()
+#: Sessions bound to the current thread by ``session_scope()``.
+_LOCAL = threading.local()
+_SNAPSHOT: Optional[Union[Snapshot, DataPack]] = None
+_EXPERIENCE_CURVES: Dict[int, ExperienceCurve] = {}
+#: The species stat tables, by engine. Snapshots keep their own.
+_SPECIES_STATS: MutableMapping[
+    sqlalchemy.engine.Engine, SpeciesStats
+] = weakref.WeakKeyDictionary()
+#: Rows loaded by ``warmup()``, by session.
+_WARM_ROWS: MutableMapping[
+    sqlalchemy.orm.session.Session, List[pokedex.db.tables.Pokemon]
+] = weakref.WeakKeyDictionary()
+
+
+def _forget_sessions() -> None:
+    """Drop the sessions a forked process inherited from its parent,
+    without closing them, as the parent may still use them."""
+    global _LOCAL
+    if isinstance(SESSION, sqlalchemy.orm.scoped_session):
+        SESSION.registry.clear()
+    _LOCAL = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_sessions)
+
+
+#: The default maximum number of cached results per query helper.
+CACHE_SIZE = 4096
+_NOT_CACHED = object()
+#: Compiled queries of the hot helpers, by the lambdas that build them.
+_BAKERY = sqlalchemy.ext.baked.bakery()
+
+
+class _QueryCache:
+    """The LRU caches of one query helper.
+
+    Records served by a snapshot are cached once. ORM rows belong to
+    the session that loaded them, so they are cached per session, and
+    each session's cache is dropped with it: a cache never keeps a
+    session, nor the pooled connection it holds, alive.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.snapshot = LRUCache(maxsize)
+        self.sessions: MutableMapping[
+            sqlalchemy.orm.session.Session, LRUCache
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> LRUCache:
+        """Get the cache for the current data source."""
+        if _SNAPSHOT is not None:
+            return self.snapshot
+        session = _session()
+        cache = self.sessions.get(session)
+        if cache is None:
+            with self._lock:
+                cache = self.sessions.setdefault(
+                    session, LRUCache(self.maxsize)
+                )
+        return cache
+
+    def caches(self) -> List[LRUCache]:
+        with self._lock:
+            return [self.snapshot, *self.sessions.values()]
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        for cache in self.caches():
+            cache.resize(maxsize)
+
+    def info(self) -> CacheInfo:
+        """The statistics of the caches of the live sessions and of the
+        snapshot, summed."""
+        infos = [cache.info() for cache in self.caches()]
+        return CacheInfo(
+            hits=sum(info.hits for info in infos),
+            misses=sum(info.misses for info in infos),
+            evictions=sum(info.evictions for info in infos),
+            maxsize=self.maxsize,
+            currsize=sum(info.currsize for info in infos),
+        )
+
+
+_QUERY_CACHES: Dict[str, _QueryCache] = {}
+
+
+def _cached(func: Callable) -> Callable:
+    """Memoize a query helper in a size-bounded LRU cache.
+
+    The results are cached by the exact arguments passed in, for the
+    data source in use: the snapshot, or the current session. Exceptions
+    are never cached.
+    """
+    caches = _QUERY_CACHES[func.__name__.lstrip('_')] = _QueryCache(CACHE_SIZE)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(kwargs.items())) if kwargs else args
+        cache = caches.get()
+        result = cache.get(key, _NOT_CACHED)
+        if result is _NOT_CACHED:
+            result = func(*args, **kwargs)
+            cache.put(key, result)
+        return result
+
+    return wrapper
+
+
+def configure_cache(maxsize: int = CACHE_SIZE) -> None:
+    """Set the maximum number of cached results per query helper and
+    data source.
+
+    :param maxsize: The new size. 0 disables the caches.
+    """
+    for caches in _QUERY_CACHES.values():
+        caches.resize(maxsize)
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """Get the hits, misses, evictions, and sizes of the query caches.
+
+    The statistics of a session's cache are dropped with the session.
+
+    :return: A dictionary of query helper names to ``CacheInfo``.
+    """
+    return {name: caches.info() for name, caches in _QUERY_CACHES.items()}
+
+
+def clear_cache(reset_stats: bool = False) -> None:
+    """Invalidate all cached query results.
+
+    :param reset_stats: Reset the cache statistics as well.
+    """
+    for caches in _QUERY_CACHES.values():
+        for cache in caches.caches():
+            cache.clear()
+            if reset_stats:
+                cache.reset_stats()
+    _EXPERIENCE_CURVES.clear()
+    _SPECIES_STATS.clear()
+
+
+def enable_instrumentation() -> None:
+    """Start recording the calls, SQL statements, and wall times of the
+    query helpers. See ``instrumentation_stats()``."""
+    _instrument.enable()
+
+
+def disable_instrumentation() -> None:
+    """Stop recording. The recorded calls are kept."""
+    _instrument.disable()
+
+
+def instrumentation_stats() -> Dict[str, QueryStats]:
+    """Get the statistics recorded since instrumentation was enabled.
+
+    The statement counts and times of a helper include those of the
+    helpers it calls. Times are in seconds.
+
+    :return: A dictionary of query helper names to ``QueryStats``.
+    """
+    return _instrument.GLOBAL.stats()
+
+
+def reset_instrumentation() -> None:
+    """Forget the recorded calls."""
+    _instrument.GLOBAL.reset()
+
+
+def measure() -> ContextManager[Collector]:
+    """Record the query helper calls made in a block, whether or not
+    instrumentation is enabled.
+
+    Usage::
+
+        >>> with measure() as collector:
+        ...     Pokemon('eevee', level=5)
+        >>> collector.stats()['get_pokemon'].calls
+        6
+    """
+    return _instrument.measure()
+
+
+def _session() -> sqlalchemy.orm.session.Session:
+    """Get the session of the current thread.
+
+    This is the innermost session bound by ``session_scope()`` if there
+    is one, or else the bound session, connecting to the default
+    database if no session is bound yet.
+    """
+    global SESSION
+    sessions = getattr(_LOCAL, 'sessions', None)
+    if sessions:
+        return sessions[-1]
+    if SESSION is None:
+        with _SESSION_LOCK:
+            if SESSION is None:
+                SESSION = get_session()
+    session = SESSION
+    if isinstance(session, sqlalchemy.orm.scoped_session):
+        return session()
+    return session
+
+
+@contextlib.contextmanager
+def session_scope(
+    session: sqlalchemy.orm.session.Session = None,
+) -> Iterator[sqlalchemy.orm.session.Session]:
+    """Bind a session to the current thread for a block of work.
+
+    Usage::
+
+        >>> with session_scope() as session:
+        ...     get_pokemon(species='eevee')  # Queried with `session`.
+
+    :param session: The session to bind. If not specified, a new
+        session is created on the bound engine, and closed when the
+        block exits.
+    """
+    owned = session is None
+    if owned:
+        session = sqlalchemy.orm.Session(bind=_session().bind)
+    if not hasattr(_LOCAL, 'sessions'):
+        _LOCAL.sessions = []
+    # Held on to, as a forked child starts over with no sessions bound.
+    sessions = _LOCAL.sessions
+    sessions.append(session)
+    try:
+        yield session
+    finally:
+        sessions.pop()
+        if owned:
+            session.close()
+
+
+def close_session() -> None:
+    """Close the session of the current thread, returning its
+    connection to the pool.
+
+    Call this when a thread that made queries is done with them, e.g.
+    at the end of a request in a thread-per-request server. Rows it
+    loaded are detached. The next query opens a new session.
+    """
+    if isinstance(SESSION, sqlalchemy.orm.scoped_session):
+        SESSION.remove()
+
+
+def connect(
+    database_uri: str = None, read_only: bool = False
+) -> sqlalchemy.orm.session.Session:
+    """Connect to a database and bind the session.
+
+    Calling this is optional: the default database is connected to
+    lazily the first time a query is made.
+
+    :param database_uri: The uri of the database. The default uri set by
+        :mod:`pokedex.defaults` will be used if not specified.
+    :param read_only: See ``get_session()``.
+    :return: The bound ``sqlalchemy.orm.session.Session``.
+    """
+    session = get_session(database_uri, read_only)
+    set_session(session)
+    return session
 
 
 def set_session(session):
-    """Bind a session."""
+    """Bind a session.
+
+    The loaded snapshot, if any, is dropped and the query caches are
+    cleared, since they hold data from the previous database.
+    """
     global SESSION
     SESSION = session
+    drop_snapshot()
+
+
+def load_snapshot(session=None) -> Snapshot:
+    """Load the static pokedex data into memory.
+
+    Once loaded, the query helpers in this module read from the
+    snapshot instead of making queries. This is the preferred mode for
+    creating lots of Pokémon.
+
+    :param session: The session to read the data from. The bound
+        session is used if not specified.
+    :return: The loaded ``Snapshot``.
+    """
+    return _replace_snapshot(Snapshot.from_session(session or _session()))
+
+
+def load_datapack(path: str) -> DataPack:
+    """Serve the query helpers from a data pack.
+
+    This works like ``load_snapshot()``, except that the data is
+    memory-mapped from a file exported by ``export_datapack()``, and
+    shared by all processes reading the same file.
+
+    A data pack loaded before is closed.
+
+    :param path: The path of the data pack.
+    :return: The loaded ``DataPack``.
+    """
+    return _replace_snapshot(DataPack(path))
+
+
+def export_datapack(
+    path: str, session=None, version_group: str = 'emerald'
+) -> None:
+    """Export the static pokedex data to a data pack.
+
+    :param path: Where to write the data pack.
+    :param session: The session to read the data from. The bound
+        session is used if not specified.
+    :param version_group: The version group used for machines and
+        learnsets.
+    """
+    write_datapack(
+        path, Snapshot.from_session(session or _session(), version_group)
+    )
+
+
+def drop_snapshot():
+    """Go back to querying the database directly.
+
+    A loaded data pack is closed.
+    """
+    _replace_snapshot(None)
+
+
+def _replace_snapshot(
+    snapshot: Optional[Union[Snapshot, DataPack]]
+) -> Optional[Union[Snapshot, DataPack]]:
+    """Serve the query helpers from ``snapshot``, closing the data pack
+    it replaces, if any."""
+    global _SNAPSHOT
+    previous, _SNAPSHOT = _SNAPSHOT, snapshot
+    clear_cache()
+    if isinstance(previous, DataPack) and previous is not snapshot:
+        previous.close()
+    return snapshot
+
+
+def missing_indexes() -> List[str]:
+    """List the names of the indexes ``ensure_indexes()`` would create
+    in the bound database."""
+    return [spec.name for spec in _provision.missing_indexes(_session().bind)]
+
+
+def ensure_indexes() -> List[str]:
+    """Add the indexes that cover the queries of this module to the
+    bound database, if it lacks them.
+
+    :return: The names of the indexes created.
+    """
+    return [spec.name for spec in _provision.ensure_indexes(_session().bind)]
 
 
 def _check_completeness(
@@ -65,6 +570,8 @@ def _check_completeness(
     raise ValueError(msg)
 
 
+@instrumented
+@_cached
 def get_pokemon(
     national_id: int = None, species: str = None, form: str = None
 ) -> pokedex.db.tables.Pokemon:
@@ -77,71 +584,263 @@ def get_pokemon(
     :return: a ``pokedex.db.tables.Pokemon`` row.
     """
     _check_completeness(national_id, species)
-    query: sqlalchemy.orm.query.Query = (
-        SESSION.query(pokedex.db.tables.Pokemon)
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_pokemon(national_id, species, form)
+    # Each combination of filters is compiled once, then reused with
+    # new parameters.
+    query = _BAKERY(
+        lambda session: session.query(pokedex.db.tables.Pokemon)
         .join(pokedex.db.tables.PokemonForm)
         .join(pokedex.db.tables.PokemonSpecies)
     )
     if national_id is not None:
-        query = query.filter(pokedex.db.tables.PokemonSpecies.id == national_id)
+        query += lambda q: q.filter(
+            pokedex.db.tables.PokemonSpecies.id == bindparam('national_id')
+        )
     if species is not None:
-        query = query.filter(
-            pokedex.db.tables.PokemonSpecies.identifier == species
+        query += lambda q: q.filter(
+            pokedex.db.tables.PokemonSpecies.identifier == bindparam('species')
         )
     if form is not None:
-        query = query.filter(
-            pokedex.db.tables.PokemonForm.form_identifier == form
+        query += lambda q: q.filter(
+            pokedex.db.tables.PokemonForm.form_identifier == bindparam('form')
         )
     else:
-        query = query.filter(pokedex.db.tables.Pokemon.is_default == 1)
-    return query.one()
+        query += lambda q: q.filter(pokedex.db.tables.Pokemon.is_default == 1)
+    return (
+        query(_session())
+        .params(national_id=national_id, species=species, form=form)
+        .one()
+    )
+
 
+@instrumented
+def get_pokemon_many(
+    national_ids: Sequence[int] = None, species: Sequence[str] = None
+) -> List[pokedex.db.tables.Pokemon]:
+    """Get the default Pokémon of many species in one query.
 
-def _get_experience_table(
+    The relationships used to build a ``Pokemon`` (species, types,
+    stats, abilities) are eagerly loaded in a fixed number of extra
+    queries, regardless of how many Pokémon are requested.
+
+    :param national_ids: The National Pokédex IDs.
+    :param species: The species identifiers. Ignored if
+        ``national_ids`` is specified.
+    :return: The ``pokedex.db.tables.Pokemon`` rows, in input order.
+    """
+    _check_completeness(national_ids, species)
+    if national_ids is not None:
+        keys, column = national_ids, pokedex.db.tables.PokemonSpecies.id
+    else:
+        keys, column = species, pokedex.db.tables.PokemonSpecies.identifier
+    if not keys:
+        return []
+    if _SNAPSHOT is not None:
+        if national_ids is not None:
+            return [_SNAPSHOT.get_pokemon(national_id=key) for key in keys]
+        return [_SNAPSHOT.get_pokemon(species=key) for key in keys]
+
+    rows = (
+        _session()
+        .query(pokedex.db.tables.Pokemon)
+        .join(pokedex.db.tables.PokemonSpecies)
+        .filter(
+            column.in_(set(keys)), pokedex.db.tables.Pokemon.is_default == 1
+        )
+        .options(
+            contains_eager(pokedex.db.tables.Pokemon.species),
+            selectinload(pokedex.db.tables.Pokemon.types),
+            selectinload(pokedex.db.tables.Pokemon.stats),
+            selectinload(pokedex.db.tables.Pokemon.abilities),
+        )
+        .all()
+    )
+    if national_ids is not None:
+        found = {row.species.id: row for row in rows}
+    else:
+        found = {row.species.identifier: row for row in rows}
+    missing = set(keys) - found.keys()
+    if missing:
+        raise NoResultFound(f'No Pokémon found for {sorted(missing)}.')
+    return [found[key] for key in keys]
+
+
+def _evolution_options(path) -> list:
+    """Eagerly load the evolutions of the species at ``path``, with the
+    rows ``Pokemon._check_evolution()`` reads."""
+    evolutions = path.selectinload(pokedex.db.tables.PokemonSpecies.evolutions)
+    return [
+        evolutions.joinedload(pokedex.db.tables.PokemonEvolution.trigger),
+        evolutions.joinedload(pokedex.db.tables.PokemonEvolution.held_item),
+        evolutions.joinedload(pokedex.db.tables.PokemonEvolution.known_move),
+    ]
+
+
+@instrumented
+def warmup(
+    national_ids: Sequence[int] = None, species: Sequence[str] = None
+) -> List[pokedex.db.tables.Pokemon]:
+    """Load the Pokémon of many species, with every relationship used to
+    build, level up, and evolve a ``Pokemon``, in a fixed number of
+    queries.
+
+    The rows are kept in the current session until it is closed, so
+    that later lookups find their relationships loaded and make no lazy
+    loading queries. Nothing is loaded while a snapshot is in use.
+
+    :param national_ids: The National Pokédex IDs to load.
+    :param species: The species identifiers to load. All species are
+        loaded if neither argument is specified.
+    :return: The ``pokedex.db.tables.Pokemon`` rows loaded.
+    """
+    if _SNAPSHOT is not None:
+        return []
+    tables = pokedex.db.tables
+    session = _session()
+    query = session.query(tables.Pokemon).join(tables.PokemonSpecies)
+    if national_ids is not None:
+        query = query.filter(tables.PokemonSpecies.id.in_(set(national_ids)))
+    elif species is not None:
+        query = query.filter(tables.PokemonSpecies.identifier.in_(set(species)))
+    species_path = contains_eager(tables.Pokemon.species)
+    rows = query.options(
+        species_path,
+        selectinload(tables.Pokemon.forms),
+        selectinload(tables.Pokemon.types),
+        selectinload(tables.Pokemon.stats),
+        selectinload(tables.Pokemon.abilities),
+        selectinload(tables.Pokemon.items).joinedload(tables.PokemonItem.item),
+        *_evolution_options(species_path),
+        *_evolution_options(
+            species_path.selectinload(tables.PokemonSpecies.child_species)
+        ),
+    ).all()
+    # The identity map only holds weak references.
+    _WARM_ROWS.setdefault(session, []).extend(rows)
+    return rows
+
+
+def _experience_curve(growth_rate_id: int) -> ExperienceCurve:
+    """Get the experience curve of a growth rate."""
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_experience_curve(growth_rate_id)
+    if not _EXPERIENCE_CURVES:
+        _EXPERIENCE_CURVES.update(load_experience_curves(_session()))
+    return _EXPERIENCE_CURVES[growth_rate_id]
+
+
+@instrumented
+def get_species_stats() -> SpeciesStats:
+    """Get the base stats and EV yields of all species, as species × 6
+    tables.
+
+    The tables are built once per data source, in one query or from the
+    snapshot, and shared afterwards.
+    """
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_species_stats()
+    # Plain data, so every session on the same engine shares it.
+    session = _session()
+    engine = session.bind.engine
+    species_stats = _SPECIES_STATS.get(engine)
+    if species_stats is None:
+        species_stats = _SPECIES_STATS[engine] = load_species_stats(session)
+    return species_stats
+
+
+@instrumented
+def get_experience_curve(
     national_id: int = None, species: str = None
-) -> sqlalchemy.orm.query.Query:
-    """Get an experience table specific to the species.
+) -> ExperienceCurve:
+    """Get the experience curve of a species' growth rate.
+
+    The curves of all growth rates are read in one query the first
+    time this is called, and looked up in memory afterwards.
 
     :param national_id: The National Pokédex ID.
     :param species: The Pokémon's species.
-    :return: sqlalchemy.orm.query.Query
+    :return: An ``ExperienceCurve``.
     """
-    # _check_completeness([national_id, species], growth_rate_id)
-    if species is not None or national_id is not None:
-        pokemon = get_pokemon(species=species, national_id=national_id)
-        conditions = {'growth_rate_id': pokemon.species.growth_rate_id}
-    else:
+    if species is None and national_id is None:
         raise ValueError(
             'Must specify either the species or the National Pokédex ID.'
         )
-    return SESSION.query(pokedex.db.tables.Experience).filter_by(**conditions)
+    pokemon = get_pokemon(species=species, national_id=national_id)
+    return _experience_curve(pokemon.species.growth_rate_id)
 
 
+@instrumented
 def get_experience(
     national_id: int = None,
     species: str = None,
     level: int = None,
     exp: int = None,
-) -> pokedex.db.tables.Experience:
-    """Look up a Pokémon's experience at various levels."""
+) -> Experience:
+    """Look up a Pokémon's experience at various levels.
+
+    If only ``exp`` is given, the highest level reached with ``exp``
+    experience points is looked up.
+    """
 
     if level is None and exp is None:
         raise ValueError('Gimme something to look up!')
 
-    query = _get_experience_table(national_id=national_id, species=species)
-    if level is not None:
-        query = query.filter_by(level=level)
-    if exp is not None:
-        query = query.filter(
-            pokedex.db.tables.Experience.experience <= exp
-        ).order_by(pokedex.db.tables.Experience.experience.desc())
-    result = query.first()
-    if result is None:
-        raise ValueError(f'Inconsistent data.')
-    else:
-        return result
+    curve = get_experience_curve(national_id=national_id, species=species)
+    return _look_up_experience(curve, level, exp)
+
 
+@instrumented
+def get_experience_many(
+    national_ids: Sequence[int] = None,
+    species: Sequence[str] = None,
+    levels: Sequence[Optional[int]] = None,
+    exps: Sequence[Optional[int]] = None,
+) -> List[Experience]:
+    """Look up the experience of many Pokémon at once.
 
+    The ``i``-th lookup is done for the ``i``-th Pokémon, at the
+    ``i``-th level and/or exp., as in ``get_experience()``. This takes
+    the queries of ``get_pokemon_many()`` plus at most one query for
+    the experience curves.
+
+    :return: The ``Experience`` records, in input order.
+    """
+    if levels is None and exps is None:
+        raise ValueError('Gimme something to look up!')
+    pokemon = get_pokemon_many(national_ids=national_ids, species=species)
+    levels = [None] * len(pokemon) if levels is None else levels
+    exps = [None] * len(pokemon) if exps is None else exps
+    if not len(pokemon) == len(levels) == len(exps):
+        raise ValueError('All sequences must have the same length.')
+    return [
+        _look_up_experience(
+            _experience_curve(pokemon_.species.growth_rate_id), level, exp
+        )
+        for pokemon_, level, exp in zip(pokemon, levels, exps)
+    ]
+
+
+def _look_up_experience(
+    curve: ExperienceCurve, level: Optional[int], exp: Optional[int]
+) -> Experience:
+    """Look up the experience row at ``level``, or the highest level
+    reached with ``exp``."""
+    if level is None and exp is None:
+        raise ValueError('Gimme something to look up!')
+    if level is None:
+        level = curve.level(exp)
+    if not 1 <= level <= curve.max_level:
+        raise ValueError('Inconsistent data.')
+    experience = curve.experience_at(level)
+    if exp is not None and experience > exp:
+        raise ValueError('Inconsistent data.')
+    return Experience(
+        growth_rate_id=curve.growth_rate_id, level=level, experience=experience
+    )
+
+
+@instrumented
 def wild_pokemon_held_item(
     prng: PRNG, national_id: int, compound_eyes: bool
 ) -> Optional[pokedex.db.tables.Item]:
@@ -167,52 +866,97 @@ def wild_pokemon_held_item(
     return None
 
 
+@_cached
+def _get_learnsets(pokemon_id: int, version_group: str) -> Dict[str, Learnset]:
+    """Get the learnsets of a Pokémon in a version group, by move
+    method, in one query."""
+    if _SNAPSHOT is not None and version_group == _SNAPSHOT.version_group:
+        return _SNAPSHOT.get_learnsets(pokemon_id)
+    query = _BAKERY(
+        lambda session: session.query(pokedex.db.tables.PokemonMove)
+        .join(pokedex.db.tables.VersionGroup)
+        .filter(
+            pokedex.db.tables.PokemonMove.pokemon_id == bindparam('pokemon_id'),
+            pokedex.db.tables.VersionGroup.identifier
+            == bindparam('version_group'),
+        )
+        .options(
+            joinedload(pokedex.db.tables.PokemonMove.move),
+            joinedload(pokedex.db.tables.PokemonMove.method),
+        )
+    )
+    rows = query(_session()).params(
+        pokemon_id=pokemon_id, version_group=version_group
+    )
+    return build_learnsets(rows).get(pokemon_id, {})
+
+
+@instrumented
+def get_learnset(
+    national_id: int = None,
+    species: str = None,
+    form: str = None,
+    move_method: str = 'level-up',
+    version_group: str = 'emerald',
+) -> Learnset:
+    """Get the moves a Pokémon learns via ``move_method``.
+
+    All learnsets of a Pokémon in a version group are indexed at once,
+    and cached.
+
+    :return: A ``Learnset``, which is empty if the Pokémon cannot learn
+        any moves via ``move_method``.
+    """
+    pokemon = get_pokemon(national_id=national_id, species=species, form=form)
+    learnset = _get_learnsets(pokemon.id, version_group).get(move_method)
+    if learnset is None:
+        return Learnset.from_pokemon_moves(())
+    return learnset
+
+
+@instrumented
 def get_pokemon_default_moves(
     level: int,
     national_id: int = None,
     species: str = None,
     form: str = None,
     version_group: str = 'emerald',
-) -> Tuple[pokedex.db.tables.Move]:
-    """Determine the moves of a wild Pokémon."""
-    pokemon = get_pokemon(national_id, species, form)
-    pokemon_moves: List[pokedex.db.tables.PokemonMove] = reversed(
-        SESSION.query(pokedex.db.tables.PokemonMove)
-        .join(pokedex.db.tables.PokemonMoveMethod)
-        .join(pokedex.db.tables.VersionGroup)
-        .filter(
-            pokedex.db.tables.PokemonMove.pokemon_id == pokemon.id,
-            pokedex.db.tables.PokemonMoveMethod.identifier == 'level-up',
-            pokedex.db.tables.PokemonMove.level <= level,
-            pokedex.db.tables.VersionGroup.identifier == version_group,
-        )
-        .order_by(pokedex.db.tables.PokemonMove.level.desc())
-        .order_by(pokedex.db.tables.PokemonMove.order)
-        .limit(4)
-        .all()
-    )
+) -> Tuple[Move, ...]:
+    """Determine the moves of a wild Pokémon, i.e. the last four moves
+    it has learned by leveling up."""
+    return get_learnset(
+        national_id=national_id,
+        species=species,
+        form=form,
+        version_group=version_group,
+    ).latest_moves(level)
 
-    # Just to get the signatures.
-    def _get_move(x: pokedex.db.tables.PokemonMove) -> pokedex.db.tables.Move:
-        return x.move
 
-    return tuple(map(_get_move, pokemon_moves))
+@instrumented
+def get_nature(personality: int = None, identifier: str = None) -> Nature:
+    """Determine a Pokémon's nature from its personality value.
 
-
-def get_nature(
-    personality: int = None, identifier: str = None
-) -> pokedex.db.tables.Nature:
-    """Determine a Pokémon's nature from its personality value."""
-    conditions = {}
+    Natures come from the constant table of ``pokemaster.natures``,
+    never from the database.
+    """
     if personality is None and identifier is None:
         raise ValueError('Gimme something to look up!')
-    if personality is not None:
-        conditions['game_index'] = personality % 25
-    if identifier is not None:
-        conditions['identifier'] = identifier
-    return SESSION.query(pokedex.db.tables.Nature).filter_by(**conditions).one()
+    game_index = None if personality is None else personality % 25
+    return natures.get_nature(game_index, identifier)
+
 
+@instrumented
+def get_nature_many(personalities: Sequence[int]) -> List[Nature]:
+    """Determine the natures of many personality values.
+
+    :param personalities: The personality values.
+    :return: The ``Nature`` records, in input order.
+    """
+    records = natures.RECORDS
+    return [records[personality % 25] for personality in personalities]
 
+
+@instrumented
 def get_ability(
     national_id: int = None,
     species: str = None,
@@ -231,6 +975,7 @@ def get_ability(
 
 
 # FIXME: change `gender_rate` to `species` (issue #6)
+@instrumented
 def get_pokemon_gender(
     national_id: int = None,
     species: str = None,
@@ -255,70 +1000,119 @@ def get_pokemon_gender(
             gender = 'male'
         else:
             gender = 'female'
+    return _get_gender(gender)
+
+
+@_cached
+def _get_gender(identifier: str) -> pokedex.db.tables.Gender:
+    """Get a gender by its identifier."""
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_gender(identifier)
     return (
-        SESSION.query(pokedex.db.tables.Gender)
-        .filter_by(identifier=gender)
+        _session()
+        .query(pokedex.db.tables.Gender)
+        .filter_by(identifier=identifier)
         .one()
     )
 
 
+@instrumented
+@_cached
 def get_move(move: str = None, move_id: int = None) -> pokedex.db.tables.Move:
     """"""
     _check_completeness(move, move_id)
-    conditions = {'generation': 3}
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_move(move, move_id)
+    conditions = {}
     if move is not None:
         conditions['identifier'] = move
     if move_id is not None:
         conditions['id'] = move_id
-    return (SESSION.query(pokedex.db.tables.Move).filter_by(**conditions)).one()
+    return (
+        _session()
+        .query(pokedex.db.tables.Move)
+        .filter(pokedex.db.tables.Move.generation_id <= MOVE_GENERATION)
+        .filter_by(**conditions)
+    ).one()
 
 
 # TODO: get it via the machine no. or the move name
+@instrumented
+@_cached
 def get_machine(
     machine_number: int = None, move_identifier: str = None, move_id: int = None
 ) -> Optional[pokedex.db.tables.Machine]:
     """Get a TM or HM by the machine number，or the move's identifier, if
     it is a valid machine."""
     _check_completeness(machine_number, move_identifier, move_id)
-    query = (
-        SESSION.query(pokedex.db.tables.Machine)
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.get_machine(machine_number, move_identifier, move_id)
+    query = _BAKERY(
+        lambda session: session.query(pokedex.db.tables.Machine)
         .join(pokedex.db.tables.VersionGroup)
         .join(pokedex.db.tables.Move)
         .filter(pokedex.db.tables.VersionGroup.identifier == 'emerald')
     )
     if machine_number is not None:
-        query = query.filter(
-            pokedex.db.tables.Machine.machine_number == machine_number
+        query += lambda q: q.filter(
+            pokedex.db.tables.Machine.machine_number
+            == bindparam('machine_number')
         )
     if move_identifier is not None:
-        query = query.filter(
-            pokedex.db.tables.Move.identifier == move_identifier
+        query += lambda q: q.filter(
+            pokedex.db.tables.Move.identifier == bindparam('move_identifier')
         )
     if move_id is not None:
-        query = query.filter(pokedex.db.tables.Move.id == move_id)
-    return query.one_or_none()
+        query += lambda q: q.filter(
+            pokedex.db.tables.Move.id == bindparam('move_id')
+        )
+    return (
+        query(_session())
+        .params(
+            machine_number=machine_number,
+            move_identifier=move_identifier,
+            move_id=move_id,
+        )
+        .one_or_none()
+    )
 
 
+@instrumented
 def get_move_pool(
-    species: str, move_method: str = None
-) -> List[pokedex.db.tables.PokemonMove]:
+    species: str,
+    move_method: str = None,
+    form: str = None,
+    version_group: str = 'emerald',
+) -> List[PokemonMove]:
     """Get a pool of moves that a Pokémon can learn via a specific
-    method."""
-    query = (
-        SESSION.query(pokedex.db.tables.PokemonMove)
-        .join(pokedex.db.tables.PokemonMoveMethod)
-        .join(pokedex.db.tables.Pokemon)
-        .join(pokedex.db.tables.PokemonSpecies)
-        .filter(
-            pokedex.db.tables.PokemonSpecies.identifier == species,
-            pokedex.db.tables.VersionGroup.identifier == 'emerald',
-        )
-    )
+    method, or via any method if ``move_method`` is not specified."""
+    pokemon = get_pokemon(species=species, form=form)
+    learnsets = _get_learnsets(pokemon.id, version_group)
     if move_method is not None:
-        query = query.filter(
-            pokedex.db.tables.PokemonMoveMethod.identifier == move_method
-        )
-    return query.all()
+        learnsets = {move_method: learnsets.get(move_method)}
+    return [
+        pokemon_move
+        for learnset in learnsets.values()
+        if learnset is not None
+        for pokemon_move in learnset.pokemon_moves
+    ]
+
+
+@instrumented
+def can_learn_move(
+    move: str,
+    species: str,
+    move_method: str = None,
+    form: str = None,
+    version_group: str = 'emerald',
+) -> bool:
+    """Check if a Pokémon can learn a move via a specific method, or
+    via any method if ``move_method`` is not specified."""
+    pokemon = get_pokemon(species=species, form=form)
+    learnsets = _get_learnsets(pokemon.id, version_group)
+    if move_method is not None:
+        return move in learnsets.get(move_method, ())
+    return any(move in learnset for learnset in learnsets.values())
 
 
 if __name__ == '__main__':
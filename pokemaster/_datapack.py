@@ -0,0 +1,798 @@
+"""Memory-mapped binary pack of the static pokedex data.
+
+A data pack holds the same data as a ``Snapshot``, in fixed-size
+little-endian records. ``DataPack`` opens a pack with ``mmap`` and
+decodes records with ``struct`` only when they are asked for, so that
+starting up costs next to nothing, and all processes reading the same
+pack share one copy of it in the page cache.
+
+Export a pack with::
+
+    $ pokemaster-datapack pokedex.pack
+
+and load it with ``_database.load_datapack('pokedex.pack')``.
+
+Layout: a header (magic, format version, section count), a directory
+of (tag, offset, size) entries, then the sections. Strings are stored
+once in ``STRS`` and referenced by their index in ``STRO``. Nullable
+integers use ``NULL``, and missing strings ``NO_STRING``.
+"""
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm.exc import NoResultFound
+
+from ._snapshot import (
+    MOVE_GENERATION,
+    ExperienceCurve,
+    Learnset,
+    Machine,
+    Move,
+    Named,
+    Pokemon,
+    PokemonEvolution,
+    PokemonForm,
+    PokemonItem,
+    PokemonMove,
+    PokemonSpecies,
+    PokemonStat,
+    Snapshot,
+    SpeciesStats,
+)
+
+MAGIC = b'PKMPACK\x00'
+#: Bump whenever the layout changes.
+FORMAT_VERSION = 3
+NULL = -0x80000000
+NO_STRING = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<8sHHI')
+_SECTION = struct.Struct('<4sII')
+_ALIGNMENT = 8
+
+#: The record layout of each section.
+_RECORDS = {
+    # version group
+    b'META': struct.Struct('<I'),
+    # offset of each string in STRS, plus the end offset
+    b'STRO': struct.Struct('<I'),
+    # id, identifier, gender rate, growth rate ID,
+    # first child in CHLD, child count, first evolution in EVOL, count
+    b'SPEC': struct.Struct('<IIiiIIII'),
+    # identifier, species ID; sorted by identifier
+    b'SPIX': struct.Struct('<II'),
+    # child species ID
+    b'CHLD': struct.Struct('<I'),
+    # trigger ID, trigger, minimum level, held item ID, held item,
+    # time of day, known move ID, minimum happiness, minimum beauty,
+    # relative physical stats, party species ID
+    b'EVOL': struct.Struct('<iIiiIIiiiii'),
+    # id, identifier, height, weight, is default, species ID,
+    # default form ID, form identifier, form's form identifier,
+    # then (first, count) of types, stats, abilities and items
+    b'POKE': struct.Struct('<IIIIIIiIIIIIIIIII'),
+    # species ID, form identifier, index in POKE; sorted by species ID
+    b'PKEY': struct.Struct('<IIi'),
+    # id, identifier of types and abilities
+    b'NAMD': struct.Struct('<iI'),
+    # base stat, effort
+    b'PSTA': struct.Struct('<ii'),
+    # item ID, item, rarity
+    b'PITM': struct.Struct('<iIi'),
+    # growth rate ID, first experience in EXPP, level count
+    b'GRWT': struct.Struct('<III'),
+    # experience points
+    b'EXPP': struct.Struct('<I'),
+    # id, identifier
+    b'GEND': struct.Struct('<iI'),
+    # id, identifier, pp, generation ID; sorted by ID
+    b'MOVE': struct.Struct('<IIiI'),
+    # identifier, move ID; sorted by identifier
+    b'MVIX': struct.Struct('<II'),
+    # machine number, move ID; sorted by machine number
+    b'MACH': struct.Struct('<II'),
+    # Pokémon ID, move ID, method ID, method, level, order;
+    # sorted by Pokémon ID
+    b'LRNS': struct.Struct('<IIiIii'),
+}
+
+
+def _nullable(value: Optional[int]) -> int:
+    return NULL if value is None else value
+
+
+def _from_nullable(value: int) -> Optional[int]:
+    return None if value == NULL else value
+
+
+class _PackWriter:
+    """Collect records and strings section by section."""
+
+    def __init__(self):
+        self.records = {tag: [] for tag in _RECORDS}
+        self.strings: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.offsets: List[int] = []
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.offsets)
+            self.offsets.append(len(self.blob))
+            self.blob += value.encode('utf-8')
+        return index
+
+    def extend(self, tag: bytes, records: Sequence[tuple]) -> Tuple[int, int]:
+        """Append records to a section, and return where they start
+        and how many there are."""
+        section = self.records[tag]
+        start = len(section)
+        section.extend(records)
+        return start, len(records)
+
+    def named(self, rows: Sequence[Named]) -> Tuple[int, int]:
+        return self.extend(
+            b'NAMD', [(row.id, self.string(row.identifier)) for row in rows]
+        )
+
+    def to_bytes(self) -> bytes:
+        self.records[b'STRO'] = [
+            (offset,) for offset in self.offsets + [len(self.blob)]
+        ]
+        sections = [
+            (tag, b''.join(_RECORDS[tag].pack(*row) for row in rows))
+            for tag, rows in self.records.items()
+        ]
+        sections.append((b'STRS', bytes(self.blob)))
+
+        offset = _HEADER.size + _SECTION.size * len(sections)
+        directory = []
+        for tag, data in sections:
+            offset += -offset % _ALIGNMENT
+            directory.append(_SECTION.pack(tag, offset, len(data)))
+            offset += len(data)
+
+        out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), 0))
+        for entry in directory:
+            out += entry
+        for tag, data in sections:
+            out += bytes(-len(out) % _ALIGNMENT)
+            out += data
+        return bytes(out)
+
+
+def _collect_species(snapshot: Snapshot) -> Dict[int, PokemonSpecies]:
+    species = {}
+    stack = [pokemon.species for pokemon in snapshot.pokemon.values()]
+    while stack:
+        record = stack.pop()
+        if record.id in species:
+            continue
+        species[record.id] = record
+        stack.extend(record.child_species)
+        stack.extend(
+            evolution.party_species
+            for evolution in record.evolutions
+            if evolution.party_species is not None
+        )
+    return species
+
+
+def pack_snapshot(snapshot: Snapshot) -> bytes:
+    """Serialize a ``Snapshot`` into a data pack.
+
+    :param snapshot: The data to export.
+    :return: The content of the pack.
+    """
+    writer = _PackWriter()
+    string = writer.string
+    writer.extend(b'META', [(string(snapshot.version_group),)])
+
+    species = _collect_species(snapshot)
+    for species_id in sorted(species):
+        record = species[species_id]
+        children = writer.extend(
+            b'CHLD', [(child.id,) for child in record.child_species]
+        )
+        evolutions = writer.extend(
+            b'EVOL',
+            [
+                (
+                    evolution.trigger.id,
+                    string(evolution.trigger.identifier),
+                    _nullable(evolution.minimum_level),
+                    _nullable(evolution.held_item and evolution.held_item.id),
+                    string(
+                        evolution.held_item and evolution.held_item.identifier
+                    ),
+                    string(evolution.time_of_day),
+                    _nullable(evolution.known_move and evolution.known_move.id),
+                    _nullable(evolution.minimum_happiness),
+                    _nullable(evolution.minimum_beauty),
+                    _nullable(evolution.relative_physical_stats),
+                    _nullable(
+                        evolution.party_species and evolution.party_species.id
+                    ),
+                )
+                for evolution in record.evolutions
+            ],
+        )
+        writer.extend(
+            b'SPEC',
+            [
+                (
+                    record.id,
+                    string(record.identifier),
+                    record.gender_rate,
+                    record.growth_rate_id,
+                    *children,
+                    *evolutions,
+                )
+            ],
+        )
+    writer.extend(
+        b'SPIX',
+        [
+            (string(identifier), species_id)
+            for identifier, species_id in sorted(snapshot.species_ids.items())
+        ],
+    )
+
+    pokemon_index = {}
+    for pokemon in snapshot.pokemon.values():
+        if pokemon.id in pokemon_index:
+            continue
+        pokemon_index[pokemon.id] = len(pokemon_index)
+        form = pokemon.default_form
+        writer.extend(
+            b'POKE',
+            [
+                (
+                    pokemon.id,
+                    string(pokemon.identifier),
+                    pokemon.height,
+                    pokemon.weight,
+                    pokemon.is_default,
+                    pokemon.species.id,
+                    _nullable(form and form.id),
+                    string(form and form.identifier),
+                    string(form and form.form_identifier),
+                    *writer.named(pokemon.types),
+                    *writer.extend(
+                        b'PSTA',
+                        [
+                            (stat.base_stat, stat.effort)
+                            for stat in pokemon.stats
+                        ],
+                    ),
+                    *writer.named(pokemon.abilities),
+                    *writer.extend(
+                        b'PITM',
+                        [
+                            (
+                                item.item.id,
+                                string(item.item.identifier),
+                                item.rarity,
+                            )
+                            for item in pokemon.items
+                        ],
+                    ),
+                )
+            ],
+        )
+    writer.extend(
+        b'PKEY',
+        sorted(
+            (
+                (species_id, string(form), pokemon_index[pokemon.id])
+                for (species_id, form), pokemon in snapshot.pokemon.items()
+            ),
+            key=lambda row: row[0],
+        ),
+    )
+
+    for growth_rate_id in sorted(snapshot.experience):
+        curve = snapshot.experience[growth_rate_id]
+        points = writer.extend(b'EXPP', [(exp,) for exp in curve.experience])
+        writer.extend(b'GRWT', [(growth_rate_id, *points)])
+
+    writer.extend(
+        b'GEND',
+        [
+            (gender.id, string(gender.identifier))
+            for gender in snapshot.genders.values()
+        ],
+    )
+    writer.extend(
+        b'MOVE',
+        [
+            (
+                move.id,
+                string(move.identifier),
+                _nullable(move.pp),
+                move.generation_id,
+            )
+            for move in sorted(snapshot.moves.values(), key=lambda x: x.id)
+        ],
+    )
+    writer.extend(
+        b'MVIX',
+        [
+            (string(identifier), move_id)
+            for identifier, move_id in sorted(snapshot.move_ids.items())
+        ],
+    )
+    writer.extend(
+        b'MACH',
+        [
+            (machine_number, snapshot.machines[machine_number].move.id)
+            for machine_number in sorted(snapshot.machines)
+        ],
+    )
+    writer.extend(
+        b'LRNS',
+        [
+            (
+                pokemon_move.pokemon_id,
+                pokemon_move.move.id,
+                pokemon_move.method.id,
+                string(pokemon_move.method.identifier),
+                pokemon_move.level,
+                _nullable(pokemon_move.order),
+            )
+            for pokemon_id in sorted(snapshot.learnsets)
+            for learnset in snapshot.learnsets[pokemon_id].values()
+            for pokemon_move in learnset.pokemon_moves
+        ],
+    )
+    return writer.to_bytes()
+
+
+def write_datapack(path: str, snapshot: Snapshot) -> None:
+    """Export a ``Snapshot`` to a data pack file.
+
+    The pack is written to a temporary file first, then renamed, so
+    readers never see a partial pack.
+
+    :param path: The path of the pack.
+    :param snapshot: The data to export.
+    """
+    data = pack_snapshot(snapshot)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp() creates private files; packs are meant to be shared.
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class _Column:
+    """A read-only sequence view of one field of a section, for
+    ``bisect``."""
+
+    def __init__(self, pack: 'DataPack', tag: bytes, field: int, decode=None):
+        self._pack = pack
+        self._tag = tag
+        self._field = field
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return self._pack._count(self._tag)
+
+    def __getitem__(self, index: int):
+        value = self._pack._record(self._tag, index)[self._field]
+        if self._decode is not None:
+            value = self._decode(value)
+        return value
+
+
+class DataPack:
+    """Static pokedex data, read from a memory-mapped data pack.
+
+    ``DataPack`` answers the same lookups as ``Snapshot``. Records are
+    decoded on first use and kept, so repeated lookups return the same
+    objects.
+
+    Usage::
+
+        >>> pack = DataPack('pokedex.pack')
+        >>> pack.get_pokemon(species='eevee').identifier
+        'eevee'
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, version, count, _ = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'Not a data pack: {path}.')
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f'Unsupported data pack version {version}, '
+                f'expected {FORMAT_VERSION}.'
+            )
+        self._sections = {}
+        for i in range(count):
+            tag, offset, size = _SECTION.unpack_from(
+                self._buffer, _HEADER.size + i * _SECTION.size
+            )
+            self._sections[tag] = (offset, size)
+        self._memo = {}
+        self.version_group: str = self._string(self._record(b'META', 0)[0])
+
+    def close(self) -> None:
+        """Unmap the pack. Records already decoded remain usable."""
+        self._buffer.release()
+        self._mmap.close()
+
+    def _count(self, tag: bytes) -> int:
+        return self._sections[tag][1] // _RECORDS[tag].size
+
+    def _record(self, tag: bytes, index: int) -> tuple:
+        record = _RECORDS[tag]
+        return record.unpack_from(
+            self._buffer, self._sections[tag][0] + index * record.size
+        )
+
+    def _records(self, tag: bytes, start: int, count: int) -> Iterator[tuple]:
+        for index in range(start, start + count):
+            yield self._record(tag, index)
+
+    def _string(self, index: int) -> Optional[str]:
+        if index == NO_STRING:
+            return None
+        start = self._record(b'STRO', index)[0]
+        stop = self._record(b'STRO', index + 1)[0]
+        offset = self._sections[b'STRS'][0]
+        return str(self._buffer[offset + start : offset + stop], 'utf-8')
+
+    def _find(
+        self, tag: bytes, key, field: int = 0, decode=None
+    ) -> Optional[int]:
+        """Binary search a section sorted by one of its fields.
+
+        :return: The index of the first record with ``key``, or None.
+        """
+        column = _Column(self, tag, field, decode)
+        index = bisect.bisect_left(column, key)
+        if index < len(column) and column[index] == key:
+            return index
+        return None
+
+    def _memoize(self, kind: str, key, build):
+        try:
+            return self._memo[kind, key]
+        except KeyError:
+            value = self._memo[kind, key] = build(key)
+            return value
+
+    def _named(self, id_: int, identifier: int) -> Optional[Named]:
+        if id_ == NULL:
+            return None
+        return Named(id=id_, identifier=self._string(identifier))
+
+    def _species(self, species_id: int) -> PokemonSpecies:
+        memo_key = ('species', species_id)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        index = self._find(b'SPEC', species_id)
+        (
+            id_,
+            identifier,
+            gender_rate,
+            growth_rate_id,
+            *children,
+            evolutions_start,
+            evolutions_count,
+        ) = self._record(b'SPEC', index)
+        species = self._memo[memo_key] = PokemonSpecies(
+            id=id_,
+            identifier=self._string(identifier),
+            gender_rate=gender_rate,
+            growth_rate_id=growth_rate_id,
+        )
+        # Children and party species may refer back to this record.
+        species.child_species.extend(
+            self._species(child_id)
+            for child_id, in self._records(b'CHLD', *children)
+        )
+        for row in self._records(b'EVOL', evolutions_start, evolutions_count):
+            (
+                trigger_id,
+                trigger,
+                minimum_level,
+                held_item_id,
+                held_item,
+                time_of_day,
+                known_move_id,
+                minimum_happiness,
+                minimum_beauty,
+                relative_physical_stats,
+                party_species_id,
+            ) = row
+            species.evolutions.append(
+                PokemonEvolution(
+                    trigger=self._named(trigger_id, trigger),
+                    minimum_level=_from_nullable(minimum_level),
+                    held_item=self._named(held_item_id, held_item),
+                    time_of_day=self._string(time_of_day),
+                    known_move=(
+                        None
+                        if known_move_id == NULL
+                        else self._move(known_move_id)
+                    ),
+                    minimum_happiness=_from_nullable(minimum_happiness),
+                    minimum_beauty=_from_nullable(minimum_beauty),
+                    relative_physical_stats=_from_nullable(
+                        relative_physical_stats
+                    ),
+                    party_species=(
+                        None
+                        if party_species_id == NULL
+                        else self._species(party_species_id)
+                    ),
+                )
+            )
+        return species
+
+    def _build_pokemon(self, index: int) -> Pokemon:
+        (
+            id_,
+            identifier,
+            height,
+            weight,
+            is_default,
+            species_id,
+            form_id,
+            form_identifier,
+            form_form_identifier,
+            *slices,
+        ) = self._record(b'POKE', index)
+        types, stats, abilities, items = zip(slices[::2], slices[1::2])
+        return Pokemon(
+            id=id_,
+            identifier=self._string(identifier),
+            height=height,
+            weight=weight,
+            is_default=bool(is_default),
+            species=self._species(species_id),
+            default_form=(
+                None
+                if form_id == NULL
+                else PokemonForm(
+                    id=form_id,
+                    identifier=self._string(form_identifier),
+                    form_identifier=self._string(form_form_identifier),
+                )
+            ),
+            types=tuple(
+                self._named(*row) for row in self._records(b'NAMD', *types)
+            ),
+            stats=tuple(
+                PokemonStat(base_stat=base_stat, effort=effort)
+                for base_stat, effort in self._records(b'PSTA', *stats)
+            ),
+            abilities=tuple(
+                self._named(*row) for row in self._records(b'NAMD', *abilities)
+            ),
+            items=tuple(
+                PokemonItem(item=self._named(item_id, item), rarity=rarity)
+                for item_id, item, rarity in self._records(b'PITM', *items)
+            ),
+        )
+
+    def _national_id(self, national_id: int = None, species: str = None) -> int:
+        """Resolve the National Pokédex ID from either argument."""
+        if species is not None:
+            index = self._find(b'SPIX', species, decode=self._string)
+            if index is None:
+                raise NoResultFound(f'No such species: {species}.')
+            species_id = self._record(b'SPIX', index)[1]
+            if national_id is not None and national_id != species_id:
+                raise NoResultFound(
+                    f'Inconsistent species ({species}) and National '
+                    f'Pokédex ID ({national_id}).'
+                )
+            return species_id
+        return national_id
+
+    def get_pokemon(
+        self, national_id: int = None, species: str = None, form: str = None
+    ) -> Pokemon:
+        """See ``_database.get_pokemon()``."""
+        key = (self._national_id(national_id, species), form)
+        index = self._find(b'PKEY', key[0])
+        while index is not None and index < self._count(b'PKEY'):
+            species_id, form_identifier, pokemon_index = self._record(
+                b'PKEY', index
+            )
+            if species_id != key[0]:
+                break
+            if self._string(form_identifier) == form:
+                return self._memoize(
+                    'pokemon', pokemon_index, self._build_pokemon
+                )
+            index += 1
+        raise NoResultFound(f'No Pokémon matches {key}.')
+
+    def get_species_stats(self) -> SpeciesStats:
+        """Get the base stat and EV yield tables of all species, built
+        on first use."""
+        return self._memoize('species_stats', None, self._build_species_stats)
+
+    def _build_species_stats(self, _) -> SpeciesStats:
+        return SpeciesStats.from_pokemon(
+            (
+                national_id,
+                self._string(identifier),
+                self.get_pokemon(national_id).stats,
+            )
+            for identifier, national_id in self._records(
+                b'SPIX', 0, self._count(b'SPIX')
+            )
+        )
+
+    def get_experience_curve(self, growth_rate_id: int) -> ExperienceCurve:
+        """Get the experience curve of a growth rate."""
+        return self._memoize(
+            'experience', growth_rate_id, self._build_experience_curve
+        )
+
+    def _build_experience_curve(self, growth_rate_id: int) -> ExperienceCurve:
+        for id_, start, count in self._records(
+            b'GRWT', 0, self._count(b'GRWT')
+        ):
+            if id_ == growth_rate_id:
+                return ExperienceCurve(
+                    growth_rate_id,
+                    tuple(exp for exp, in self._records(b'EXPP', start, count)),
+                )
+        raise KeyError(growth_rate_id)
+
+    def get_learnsets(self, pokemon_id: int) -> Dict[str, Learnset]:
+        """Get the learnsets of a Pokémon in ``version_group``, by move
+        method."""
+        return self._memoize('learnsets', pokemon_id, self._build_learnsets)
+
+    def _build_learnsets(self, pokemon_id: int) -> Dict[str, Learnset]:
+        grouped = {}
+        index = self._find(b'LRNS', pokemon_id)
+        while index is not None and index < self._count(b'LRNS'):
+            (
+                row_pokemon_id,
+                move_id,
+                method_id,
+                method,
+                level,
+                order,
+            ) = self._record(b'LRNS', index)
+            if row_pokemon_id != pokemon_id:
+                break
+            method = self._named(method_id, method)
+            grouped.setdefault(method.identifier, []).append(
+                PokemonMove(
+                    pokemon_id=pokemon_id,
+                    move=self._move(move_id),
+                    method=method,
+                    level=level,
+                    order=_from_nullable(order),
+                )
+            )
+            index += 1
+        return {
+            method: Learnset.from_pokemon_moves(rows)
+            for method, rows in grouped.items()
+        }
+
+    def get_gender(self, identifier: str) -> Named:
+        """Get a gender by its identifier."""
+        for id_, gender in self._records(b'GEND', 0, self._count(b'GEND')):
+            if self._string(gender) == identifier:
+                return self._named(id_, gender)
+        raise KeyError(identifier)
+
+    def _move(self, move_id: int) -> Move:
+        return self._memoize('move', move_id, self._build_move)
+
+    def _build_move(self, move_id: int) -> Move:
+        index = self._find(b'MOVE', move_id)
+        if index is None:
+            raise NoResultFound(f'No such move: {move_id}.')
+        id_, identifier, pp, generation_id = self._record(b'MOVE', index)
+        return Move(
+            id=id_,
+            identifier=self._string(identifier),
+            pp=_from_nullable(pp),
+            generation_id=generation_id,
+        )
+
+    def _move_id(self, move: str) -> Optional[int]:
+        index = self._find(b'MVIX', move, decode=self._string)
+        if index is None:
+            return None
+        return self._record(b'MVIX', index)[1]
+
+    def get_move(self, move: str = None, move_id: int = None) -> Move:
+        """See ``_database.get_move()``."""
+        if move is not None:
+            found = self._move_id(move)
+            if found is None or (move_id is not None and found != move_id):
+                raise NoResultFound(f'No such move: {move}.')
+            move_id = found
+        record = self._move(move_id)
+        if record.generation_id > MOVE_GENERATION:
+            raise NoResultFound(f'No such move: {move_id}.')
+        return record
+
+    def get_machine(
+        self,
+        machine_number: int = None,
+        move_identifier: str = None,
+        move_id: int = None,
+    ) -> Optional[Machine]:
+        """See ``_database.get_machine()``."""
+        if move_identifier is not None:
+            found = self._move_id(move_identifier)
+            if found is None or (move_id is not None and move_id != found):
+                return None
+            move_id = found
+        if machine_number is not None:
+            index = self._find(b'MACH', machine_number)
+        else:
+            index = next(
+                (
+                    i
+                    for i in range(self._count(b'MACH'))
+                    if self._record(b'MACH', i)[1] == move_id
+                ),
+                None,
+            )
+        if index is None:
+            return None
+        number, machine_move_id = self._record(b'MACH', index)
+        if move_id is not None and machine_move_id != move_id:
+            return None
+        return self._memoize(
+            'machine',
+            number,
+            lambda _: Machine(
+                machine_number=number, move=self._move(machine_move_id)
+            ),
+        )
+
+
+def main(argv: Sequence[str] = None) -> None:
+    """Export the pokedex database to a data pack."""
+    from . import _database
+
+    parser = argparse.ArgumentParser(
+        prog='pokemaster-datapack', description=main.__doc__
+    )
+    parser.add_argument('path', help='where to write the pack')
+    parser.add_argument('--database-uri', help='the pokedex database URI')
+    parser.add_argument(
+        '--version-group',
+        default='emerald',
+        help='the version group of machines and learnsets',
+    )
+    args = parser.parse_args(argv)
+    _database.export_datapack(
+        args.path,
+        session=_database.get_session(args.database_uri),
+        version_group=args.version_group,
+    )
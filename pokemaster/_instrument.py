@@ -0,0 +1,177 @@
+"""Opt-in timing and SQL statement counts of the query helpers.
+
+Helpers wrapped with ``instrumented`` report each call to the active
+collectors. With no active collector, the wrapper only checks an empty
+tuple before calling through, and no SQLAlchemy event is listened to.
+"""
+import collections
+import contextlib
+import functools
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Iterator, Tuple
+
+import sqlalchemy.engine
+import sqlalchemy.event
+
+QueryStats = namedtuple(
+    'QueryStats',
+    ('calls', 'statements', 'total_time', 'p50', 'p90', 'p99', 'max_time'),
+)
+
+#: The number of most recent calls the percentiles are computed from.
+SAMPLE_SIZE = 10000
+
+_LOCK = threading.Lock()
+#: SQL statements executed by the current thread.
+_LOCAL = threading.local()
+
+
+def _percentile(samples, fraction: float) -> float:
+    """The nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[max(0, int(round(fraction * len(samples))) - 1)]
+
+
+class Collector:
+    """Per-helper call counts, SQL statement counts, and wall times.
+
+    The statement count and wall time of a helper include those of the
+    helpers it calls.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self._sample_size = sample_size
+        self._lock = threading.Lock()
+        self._calls = collections.Counter()
+        self._statements = collections.Counter()
+        self._total_time = collections.Counter()
+        self._samples: Dict[str, collections.deque] = {}
+
+    def record(self, name: str, elapsed: float, statements: int) -> None:
+        """Record one call of a helper."""
+        with self._lock:
+            self._calls[name] += 1
+            self._statements[name] += statements
+            self._total_time[name] += elapsed
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = collections.deque(
+                    maxlen=self._sample_size
+                )
+            samples.append(elapsed)
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            self._calls.clear()
+            self._statements.clear()
+            self._total_time.clear()
+            self._samples.clear()
+
+    def stats(self) -> Dict[str, QueryStats]:
+        """Summarize the recorded calls, by helper name. Times are in
+        seconds."""
+        with self._lock:
+            samples = {
+                name: sorted(times) for name, times in self._samples.items()
+            }
+            return {
+                name: QueryStats(
+                    calls=self._calls[name],
+                    statements=self._statements[name],
+                    total_time=self._total_time[name],
+                    p50=_percentile(times, 0.5),
+                    p90=_percentile(times, 0.9),
+                    p99=_percentile(times, 0.99),
+                    max_time=times[-1],
+                )
+                for name, times in samples.items()
+            }
+
+
+#: The collector behind ``enable()`` and ``stats()``.
+GLOBAL = Collector()
+#: The active collectors. Replaced, never mutated, so that wrappers can
+#: read it without locking.
+_COLLECTORS: Tuple[Collector, ...] = ()
+
+
+def _count_statement(*args) -> None:
+    _LOCAL.statements = getattr(_LOCAL, 'statements', 0) + 1
+
+
+def _activate(collector: Collector) -> None:
+    global _COLLECTORS
+    with _LOCK:
+        if collector in _COLLECTORS:
+            return
+        if not _COLLECTORS:
+            sqlalchemy.event.listen(
+                sqlalchemy.engine.Engine,
+                'before_cursor_execute',
+                _count_statement,
+            )
+        _COLLECTORS += (collector,)
+
+
+def _deactivate(collector: Collector) -> None:
+    global _COLLECTORS
+    with _LOCK:
+        if collector not in _COLLECTORS:
+            return
+        collectors = list(_COLLECTORS)
+        collectors.remove(collector)
+        _COLLECTORS = tuple(collectors)
+        if not _COLLECTORS:
+            sqlalchemy.event.remove(
+                sqlalchemy.engine.Engine,
+                'before_cursor_execute',
+                _count_statement,
+            )
+
+
+def instrumented(func: Callable) -> Callable:
+    """Report the calls of a helper to the active collectors."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _COLLECTORS:
+            return func(*args, **kwargs)
+        statements = getattr(_LOCAL, 'statements', 0)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            statements = getattr(_LOCAL, 'statements', 0) - statements
+            for collector in _COLLECTORS:
+                collector.record(name, elapsed, statements)
+
+    return wrapper
+
+
+def enable() -> None:
+    """Start recording into the global collector."""
+    _activate(GLOBAL)
+
+
+def disable() -> None:
+    """Stop recording into the global collector. Recorded calls are
+    kept."""
+    _deactivate(GLOBAL)
+
+
+@contextlib.contextmanager
+def measure() -> Iterator[Collector]:
+    """Record the calls made in a block, by any thread, into a new
+    collector."""
+    collector = Collector()
+    _activate(collector)
+    try:
+        yield collector
+    finally:
+        _deactivate(collector)
@@ -0,0 +1,305 @@
+"""Build the SQLite pokedex database on first run.
+
+``pokedex.db.load`` inserts the CSV files row by row through the ORM,
+which takes minutes. ``provision()`` either copies a prebuilt database,
+or loads the CSV files with ``sqlite3.executemany`` into tables that
+have no indexes yet, with journaling and syncing turned off, and then
+creates the indexes.
+
+The database is built in a temporary file next to the target, and
+renamed into place once complete. A lock file serializes concurrent
+provisioning, so processes starting at once build the database only
+once, and nobody ever opens a half-built one.
+"""
+import contextlib
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import urllib.parse
+from collections import namedtuple
+from typing import Iterator, List, Optional
+
+import pokedex.db.tables
+import pokedex.defaults
+import sqlalchemy
+import sqlalchemy.engine.url
+import sqlalchemy.types
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+#: The path of a prebuilt database to copy instead of loading the CSVs.
+PREBUILT_ENV = 'POKEMASTER_PREBUILT_DB'
+#: Rows per ``executemany`` call.
+BATCH_SIZE = 10000
+
+IndexSpec = namedtuple('IndexSpec', ('name', 'table', 'columns'))
+
+#: Indexes that cover the queries of ``_database``, on top of the ones
+#: in the pokedex schema. Each one holds every column its query reads,
+#: so that SQLite answers from the index alone.
+INDEXES = (
+    # Learnsets: by Pokémon and version group.
+    IndexSpec(
+        'ix_pokemaster_pokemon_moves',
+        'pokemon_moves',
+        (
+            'pokemon_id',
+            'version_group_id',
+            'pokemon_move_method_id',
+            'level',
+            'move_id',
+            'order',
+        ),
+    ),
+    # Experience curves.
+    IndexSpec(
+        'ix_pokemaster_experience',
+        'experience',
+        ('growth_rate_id', 'level', 'experience'),
+    ),
+    # Machines: by version group, then machine number or move.
+    IndexSpec(
+        'ix_pokemaster_machines',
+        'machines',
+        ('version_group_id', 'machine_number', 'move_id', 'item_id'),
+    ),
+    IndexSpec(
+        'ix_pokemaster_machines_move',
+        'machines',
+        ('version_group_id', 'move_id', 'machine_number', 'item_id'),
+    ),
+    # Pokémon: by species and form.
+    IndexSpec(
+        'ix_pokemaster_pokemon_forms',
+        'pokemon_forms',
+        ('pokemon_id', 'form_identifier'),
+    ),
+    IndexSpec(
+        'ix_pokemaster_pokemon_species', 'pokemon_species', ('identifier', 'id')
+    ),
+    IndexSpec('ix_pokemaster_moves', 'moves', ('identifier', 'id')),
+)
+
+_PRAGMAS = (
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536',
+)
+
+
+def sqlite_path(database_uri: str) -> Optional[str]:
+    """The file path of a SQLite database URI, or None if the URI is
+    not a file-based SQLite database."""
+    url = sqlalchemy.engine.url.make_url(database_uri)
+    if url.get_backend_name() != 'sqlite' or url.database in (
+        None,
+        '',
+        ':memory:',
+    ):
+        return None
+    return url.database
+
+
+def is_provisioned(path: str) -> bool:
+    """Check if the database at ``path`` has the pokedex tables."""
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return False
+    uri = 'file:{}?mode=ro'.format(urllib.parse.quote(os.path.abspath(path)))
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        return bool(
+            connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                'AND name = ?',
+                (pokedex.db.tables.Pokemon.__tablename__,),
+            ).fetchone()
+        )
+    finally:
+        connection.close()
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` for a block, across
+    processes."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _convert(column: sqlalchemy.Column, value: str):
+    """Convert a CSV value the way ``pokedex.db.load`` does."""
+    if value == '' and column.nullable:
+        return None
+    if isinstance(column.type, sqlalchemy.types.Boolean):
+        return {'0': False, '1': True}[value]
+    return value
+
+
+def load_csv(path: str, csv_dir: str = None) -> None:
+    """Build a SQLite pokedex database from the CSV files.
+
+    :param path: The database file. It must not have the tables yet.
+    :param csv_dir: The directory of the CSV files. Defaults to the one
+        shipped with ``pokedex``.
+    """
+    csv_dir = csv_dir or pokedex.defaults.get_default_csv_dir()
+    dialect = sqlite.dialect()
+    metadata = pokedex.db.tables.metadata
+    connection = sqlite3.connect(path)
+    try:
+        for pragma in _PRAGMAS:
+            connection.execute(pragma)
+        with connection:
+            for table in metadata.sorted_tables:
+                connection.execute(
+                    str(CreateTable(table).compile(dialect=dialect))
+                )
+                csv_path = os.path.join(csv_dir, f'{table.name}.csv')
+                if not os.path.exists(csv_path):
+                    continue
+                with open(csv_path, encoding='utf-8', newline='') as f:
+                    reader = csv.reader(f)
+                    columns = [table.c[name] for name in next(reader)]
+                    statement = 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+                        table.name,
+                        ', '.join(f'"{column.name}"' for column in columns),
+                        ', '.join('?' * len(columns)),
+                    )
+                    batch = []
+                    for row in reader:
+                        batch.append(tuple(map(_convert, columns, row)))
+                        if len(batch) >= BATCH_SIZE:
+                            connection.executemany(statement, batch)
+                            batch.clear()
+                    connection.executemany(statement, batch)
+            # Indexing the full tables once beats updating the indexes
+            # on every insert.
+            for table in metadata.sorted_tables:
+                for index in table.indexes:
+                    connection.execute(
+                        str(CreateIndex(index).compile(dialect=dialect))
+                    )
+            for spec in INDEXES:
+                connection.execute(_create_index_sql(spec))
+        connection.execute('ANALYZE')
+    finally:
+        connection.close()
+
+
+def _create_index_sql(spec: IndexSpec) -> str:
+    return 'CREATE INDEX IF NOT EXISTS "{}" ON "{}" ({})'.format(
+        spec.name, spec.table, ', '.join(f'"{x}"' for x in spec.columns)
+    )
+
+
+def missing_indexes(bind: sqlalchemy.engine.Connectable) -> List[IndexSpec]:
+    """List the ``INDEXES`` a database lacks.
+
+    An index counts as present if an index with the same leading
+    columns exists, whatever its name.
+
+    :param bind: An engine or connection to the database.
+    :return: The missing ``IndexSpec`` tuples.
+    """
+    inspector = sqlalchemy.inspect(bind)
+    tables = set(inspector.get_table_names())
+    existing = {}
+    missing = []
+    for spec in INDEXES:
+        if spec.table not in tables:
+            continue
+        if spec.table not in existing:
+            existing[spec.table] = [
+                tuple(index['column_names'])
+                for index in inspector.get_indexes(spec.table)
+            ]
+        if not any(
+            columns[: len(spec.columns)] == spec.columns
+            for columns in existing[spec.table]
+        ):
+            missing.append(spec)
+    return missing
+
+
+def ensure_indexes(bind: sqlalchemy.engine.Connectable) -> List[IndexSpec]:
+    """Create the missing ``INDEXES``, and refresh the statistics the
+    query planner uses. The database must be writable.
+
+    :param bind: An engine or connection to the database.
+    :return: The ``IndexSpec`` tuples created.
+    """
+    missing = missing_indexes(bind)
+    if missing:
+        with bind.connect() as connection, connection.begin():
+            for spec in missing:
+                connection.execute(_create_index_sql(spec))
+            connection.execute('ANALYZE')
+    return missing
+
+
+def provision(
+    database_uri: str = None, prebuilt: str = None, csv_dir: str = None
+) -> bool:
+    """Build the pokedex database at ``database_uri`` if it is empty.
+
+    This is safe to call from several processes at once: one builds
+    the database while the others wait for it.
+
+    :param database_uri: A file-based SQLite URI. Defaults to the
+        ``pokedex`` default.
+    :param prebuilt: A prebuilt database file to copy. Defaults to the
+        ``POKEMASTER_PREBUILT_DB`` environment variable. The CSV files
+        are loaded if neither is set.
+    :param csv_dir: The directory of the CSV files.
+    :return: True if the database was built by this call.
+    :raise ValueError: if the URI is not a file-based SQLite database.
+    """
+    database_uri = database_uri or pokedex.defaults.get_default_db_uri()
+    path = sqlite_path(database_uri)
+    if path is None:
+        raise ValueError(f'Not a SQLite database file: {database_uri}.')
+    path = os.path.abspath(path)
+    prebuilt = prebuilt or os.environ.get(PREBUILT_ENV)
+
+    if is_provisioned(path):
+        return False
+    with _file_lock(f'{path}.lock'):
+        # Someone else may have built it while we waited.
+        if is_provisioned(path):
+            return False
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix='.tmp'
+        )
+        os.close(fd)
+        try:
+            if prebuilt:
+                shutil.copyfile(prebuilt, temp_path)
+            else:
+                load_csv(temp_path, csv_dir)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    return True
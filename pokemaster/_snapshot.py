@@ -0,0 +1,704 @@
+"""In-memory snapshot of the static pokedex data.
+
+A ``Snapshot`` reads every row ``pokemaster`` needs from the pokedex
+database in a handful of queries, and keeps them as light-weight
+records that mimic the attributes of ``pokedex.db.tables``. Once a
+snapshot is loaded through ``_database.load_snapshot()``, the query
+helpers in ``_database`` answer from memory instead of the database.
+"""
+import bisect
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import attr
+import pokedex.db.tables as tb
+import sqlalchemy.orm
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.exc import NoResultFound
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional.
+    np = None
+
+#: The latest generation of the moves ``_database.get_move()`` finds.
+MOVE_GENERATION = 3
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Named:
+    """A row that is only used through its identifier, e.g. types,
+    abilities, genders, items, stats, and evolution triggers."""
+
+    id: int
+    identifier: str
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonForm:
+    """A ``pokedex.db.tables.PokemonForm`` record."""
+
+    id: int
+    identifier: str
+    form_identifier: Optional[str]
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonStat:
+    """A ``pokedex.db.tables.PokemonStat`` record."""
+
+    base_stat: int
+    effort: int
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonItem:
+    """A ``pokedex.db.tables.PokemonItem`` record."""
+
+    item: Named
+    rarity: int
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Move:
+    """A ``pokedex.db.tables.Move`` record."""
+
+    id: int
+    identifier: str
+    pp: Optional[int]
+    generation_id: int
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonEvolution:
+    """A ``pokedex.db.tables.PokemonEvolution`` record."""
+
+    trigger: Named
+    minimum_level: Optional[int]
+    held_item: Optional[Named]
+    time_of_day: Optional[str]
+    known_move: Optional[Move]
+    minimum_happiness: Optional[int]
+    minimum_beauty: Optional[int]
+    relative_physical_stats: Optional[int]
+    party_species: Optional['PokemonSpecies'] = attr.ib(repr=False)
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonSpecies:
+    """A ``pokedex.db.tables.PokemonSpecies`` record."""
+
+    id: int
+    identifier: str
+    gender_rate: int
+    growth_rate_id: int
+    child_species: List['PokemonSpecies'] = attr.ib(factory=list, repr=False)
+    evolutions: List[PokemonEvolution] = attr.ib(factory=list, repr=False)
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Pokemon:
+    """A ``pokedex.db.tables.Pokemon`` record."""
+
+    id: int
+    identifier: str
+    height: int
+    weight: int
+    is_default: bool
+    species: PokemonSpecies = attr.ib(repr=False)
+    default_form: PokemonForm = attr.ib(repr=False)
+    types: Tuple[Named, ...] = attr.ib(repr=False)
+    stats: Tuple[PokemonStat, ...] = attr.ib(repr=False)
+    abilities: Tuple[Named, ...] = attr.ib(repr=False)
+    items: Tuple[PokemonItem, ...] = attr.ib(repr=False)
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Experience:
+    """A ``pokedex.db.tables.Experience`` record."""
+
+    growth_rate_id: int
+    level: int
+    experience: int
+
+
+@attr.s(slots=True, frozen=True, auto_attribs=True)
+class ExperienceCurve:
+    """The minimum experience points required at each level of a
+    growth rate.
+
+    Usage::
+
+        >>> curve = ExperienceCurve(2, (0, 8, 27, 64))
+        >>> curve.level(30)
+        3
+        >>> curve.experience_at(4)
+        64
+    """
+
+    growth_rate_id: int
+    #: The experience points at level ``i + 1``.
+    experience: Tuple[int, ...]
+
+    @property
+    def max_level(self) -> int:
+        """The highest level on the curve."""
+        return len(self.experience)
+
+    def level(self, exp: int) -> int:
+        """The level reached with ``exp`` experience points, or 0 if
+        ``exp`` is not enough for level 1."""
+        return bisect.bisect_right(self.experience, exp)
+
+    def experience_at(self, level: int) -> int:
+        """The minimum experience points at ``level``."""
+        if not 1 <= level <= len(self.experience):
+            raise ValueError(f'Invalid level: {level}.')
+        return self.experience[level - 1]
+
+
+def load_experience_curves(
+    session: sqlalchemy.orm.session.Session,
+) -> Dict[int, ExperienceCurve]:
+    """Read the experience curves of all growth rates in one query.
+
+    :param session: A session connected to a pokedex database.
+    :return: A dictionary of growth rate IDs to ``ExperienceCurve``.
+    """
+    experience = {}
+    for growth_rate_id, level, exp in session.query(
+        tb.Experience.growth_rate_id,
+        tb.Experience.level,
+        tb.Experience.experience,
+    ).order_by(tb.Experience.growth_rate_id, tb.Experience.level):
+        points = experience.setdefault(growth_rate_id, [])
+        if level != len(points) + 1:
+            raise ValueError('Inconsistent data.')
+        points.append(exp)
+    return {
+        growth_rate_id: ExperienceCurve(growth_rate_id, tuple(points))
+        for growth_rate_id, points in experience.items()
+    }
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class SpeciesStats:
+    """The base stats and EV yields of the default Pokémon of every
+    species, as species × 6 tables in the order of ``Stats``.
+
+    Rows are sorted by National Pokédex ID.
+    """
+
+    national_ids: Tuple[int, ...]
+    identifiers: Tuple[str, ...]
+    base_stats: Tuple[Tuple[int, ...], ...]
+    effort: Tuple[Tuple[int, ...], ...]
+    _rows: Dict[object, int] = attr.ib(init=False, repr=False)
+    _arrays: Dict[str, object] = attr.ib(init=False, repr=False, factory=dict)
+
+    def __attrs_post_init__(self):
+        self._rows = {}
+        for row, (national_id, identifier) in enumerate(
+            zip(self.national_ids, self.identifiers)
+        ):
+            self._rows[national_id] = self._rows[identifier] = row
+
+    @classmethod
+    def from_pokemon(
+        cls, pokemon: Iterable[Tuple[int, str, Iterable[tb.PokemonStat]]]
+    ) -> 'SpeciesStats':
+        """Build the tables from (national ID, species identifier, stat
+        rows) of the default Pokémon of each species."""
+        pokemon = sorted(pokemon, key=lambda x: x[0])
+        return cls(
+            national_ids=tuple(national_id for national_id, _, _ in pokemon),
+            identifiers=tuple(identifier for _, identifier, _ in pokemon),
+            base_stats=tuple(
+                tuple(stat.base_stat for stat in stats)
+                for _, _, stats in pokemon
+            ),
+            effort=tuple(
+                tuple(stat.effort for stat in stats) for _, _, stats in pokemon
+            ),
+        )
+
+    def row(self, national_id: int = None, species: str = None) -> int:
+        """The row of a species, by National Pokédex ID or identifier.
+
+        :raise NoResultFound: if the species is unknown, or the two
+            arguments disagree.
+        """
+        row = self._rows.get(species if species is not None else national_id)
+        if row is None or (
+            national_id is not None and self.national_ids[row] != national_id
+        ):
+            raise NoResultFound(f'No such species: {species or national_id}.')
+        return row
+
+    def rows(self, national_ids: 'np.ndarray') -> 'np.ndarray':
+        """The rows of an array of National Pokédex IDs, at once.
+        Requires NumPy."""
+        lookup = self._arrays.get('rows')
+        if lookup is None:
+            if np is None:
+                raise ImportError('The arrays require NumPy: pip install numpy')
+            lookup = np.full(max(self.national_ids) + 1, -1, dtype=np.intp)
+            lookup[list(self.national_ids)] = range(len(self.national_ids))
+            self._arrays['rows'] = lookup
+        national_ids = np.asarray(national_ids)
+        known = (national_ids >= 0) & (national_ids < len(lookup))
+        rows = lookup[np.where(known, national_ids, 0)]
+        if not known.all() or (rows < 0).any():
+            raise NoResultFound('Unknown National Pokédex IDs.')
+        return rows
+
+    def array(self, table: str) -> 'np.ndarray':
+        """A table as a read-only species × 6 NumPy array.
+
+        :param table: 'base_stats' or 'effort'.
+        """
+        array = self._arrays.get(table)
+        if array is None:
+            if np is None:
+                raise ImportError('The arrays require NumPy: pip install numpy')
+            array = np.array(getattr(self, table), dtype=np.int64)
+            array.flags.writeable = False
+            self._arrays[table] = array
+        return array
+
+
+def load_species_stats(
+    session: sqlalchemy.orm.session.Session,
+) -> SpeciesStats:
+    """Read the base stats and EV yields of all species in one query.
+
+    :param session: A session connected to a pokedex database.
+    :return: A ``SpeciesStats``.
+    """
+    pokemon = {}
+    for national_id, identifier, stat in (
+        session.query(
+            tb.PokemonSpecies.id, tb.PokemonSpecies.identifier, tb.PokemonStat
+        )
+        .join(tb.Pokemon, tb.Pokemon.species_id == tb.PokemonSpecies.id)
+        .join(tb.PokemonStat, tb.PokemonStat.pokemon_id == tb.Pokemon.id)
+        .filter(tb.Pokemon.is_default == 1)
+        .order_by(tb.PokemonSpecies.id, tb.PokemonStat.stat_id)
+    ):
+        pokemon.setdefault(national_id, (national_id, identifier, []))[
+            2
+        ].append(stat)
+    return SpeciesStats.from_pokemon(pokemon.values())
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Nature:
+    """A ``pokedex.db.tables.Nature`` record."""
+
+    id: int
+    identifier: str
+    game_index: int
+    is_neutral: bool
+    increased_stat: Named
+    decreased_stat: Named
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class Machine:
+    """A ``pokedex.db.tables.Machine`` record."""
+
+    machine_number: int
+    move: Move
+
+    @property
+    def move_id(self) -> int:
+        """The ID of the move taught by the machine."""
+        return self.move.id
+
+    @property
+    def is_hm(self) -> bool:
+        """True if the machine is an HM."""
+        return self.machine_number >= 100
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PokemonMove:
+    """A ``pokedex.db.tables.PokemonMove`` record."""
+
+    pokemon_id: int
+    move: Move
+    method: Named
+    level: int
+    order: Optional[int]
+
+
+@attr.s(slots=True, frozen=True, auto_attribs=True)
+class Learnset:
+    """The moves a Pokémon learns via one move method, in one version
+    group.
+
+    Use ``Learnset.from_pokemon_moves()`` to build one.
+    """
+
+    #: Sorted by level, then by the reversed in-game order, which is
+    #: the order the moves are known in.
+    pokemon_moves: Tuple[PokemonMove, ...]
+    move_identifiers: FrozenSet[str]
+    #: The last four moves learned by level ``i``, up to the highest
+    #: level in the learnset.
+    latest_moves_by_level: Tuple[Tuple[Move, ...], ...] = attr.ib(repr=False)
+
+    @classmethod
+    def from_pokemon_moves(
+        cls, pokemon_moves: Iterable[PokemonMove]
+    ) -> 'Learnset':
+        """Index the moves of one Pokémon and one move method."""
+        # Moves with no in-game order come first, as in SQLite.
+        pokemon_moves = sorted(
+            pokemon_moves,
+            key=lambda x: (-x.level, x.order is not None, x.order or 0),
+        )
+        pokemon_moves.reverse()
+        levels = [pokemon_move.level for pokemon_move in pokemon_moves]
+        latest_moves = []
+        for level in range(max(levels, default=0) + 1):
+            stop = bisect.bisect_right(levels, level)
+            latest_moves.append(
+                tuple(x.move for x in pokemon_moves[max(0, stop - 4) : stop])
+            )
+        return cls(
+            pokemon_moves=tuple(pokemon_moves),
+            move_identifiers=frozenset(
+                pokemon_move.move.identifier for pokemon_move in pokemon_moves
+            ),
+            latest_moves_by_level=tuple(latest_moves),
+        )
+
+    def __contains__(self, move: str) -> bool:
+        return move in self.move_identifiers
+
+    def latest_moves(self, level: int) -> Tuple[Move, ...]:
+        """The last (up to) four moves learned by ``level``."""
+        if level < 0:
+            return ()
+        return self.latest_moves_by_level[
+            min(level, len(self.latest_moves_by_level) - 1)
+        ]
+
+
+def build_learnsets(
+    pokemon_moves: Iterable['tb.PokemonMove'], moves: Dict[int, Move] = None
+) -> Dict[int, Dict[str, Learnset]]:
+    """Index ``pokedex.db.tables.PokemonMove`` rows of one version group.
+
+    :param pokemon_moves: The rows, with their ``method`` loaded.
+    :param moves: Move records by ID, to share them between learnsets.
+        The records are created from the rows' ``move`` if not given.
+    :return: Pokémon ID -> move method identifier -> ``Learnset``.
+    """
+    grouped = {}
+    for row in pokemon_moves:
+        if moves is not None:
+            move = moves[row.move_id]
+        else:
+            move = Move(
+                id=row.move.id,
+                identifier=row.move.identifier,
+                pp=row.move.pp,
+                generation_id=row.move.generation_id,
+            )
+        grouped.setdefault(row.pokemon_id, {}).setdefault(
+            row.method.identifier, []
+        ).append(
+            PokemonMove(
+                pokemon_id=row.pokemon_id,
+                move=move,
+                method=_named(row.method),
+                level=row.level,
+                order=row.order,
+            )
+        )
+    return {
+        pokemon_id: {
+            method: Learnset.from_pokemon_moves(rows)
+            for method, rows in methods.items()
+        }
+        for pokemon_id, methods in grouped.items()
+    }
+
+
+def _named(row) -> Optional[Named]:
+    """Convert an identifier-only row into a ``Named`` record."""
+    if row is None:
+        return None
+    return Named(id=row.id, identifier=row.identifier)
+
+
+@attr.s(slots=True, auto_attribs=True)
+class Snapshot:
+    """Static pokedex data, indexed for the ``_database`` helpers.
+
+    Usage::
+
+        >>> snapshot = Snapshot.from_session(session)
+        >>> snapshot.get_pokemon(species='eevee').identifier
+        'eevee'
+    """
+
+    version_group: str
+    #: (national ID, form identifier) -> Pokémon. The default Pokémon
+    #: of a species is also keyed by (national ID, None).
+    pokemon: Dict[Tuple[int, Optional[str]], Pokemon]
+    species_ids: Dict[str, int]
+    experience: Dict[int, ExperienceCurve]
+    genders: Dict[str, Named]
+    moves: Dict[int, Move]
+    move_ids: Dict[str, int]
+    machines: Dict[int, Machine]
+    machines_by_move: Dict[int, Machine]
+    #: Pokémon ID -> move method -> learnset in ``version_group``.
+    learnsets: Dict[int, Dict[str, Learnset]]
+    _species_stats: Optional[SpeciesStats] = attr.ib(
+        default=None, init=False, repr=False, cmp=False
+    )
+
+    @classmethod
+    def from_session(
+        cls,
+        session: sqlalchemy.orm.session.Session,
+        version_group: str = 'emerald',
+    ) -> 'Snapshot':
+        """Read the static data from a database session.
+
+        :param session: A session connected to a pokedex database.
+        :param version_group: The version group used for machines and
+            learnsets.
+        :return: A ``Snapshot`` instance.
+        """
+        moves = {
+            row.id: Move(
+                id=row.id,
+                identifier=row.identifier,
+                pp=row.pp,
+                generation_id=row.generation_id,
+            )
+            for row in session.query(tb.Move)
+        }
+
+        species_rows = (
+            session.query(tb.PokemonSpecies)
+            .options(
+                selectinload(tb.PokemonSpecies.evolutions).joinedload(
+                    tb.PokemonEvolution.trigger
+                ),
+                selectinload(tb.PokemonSpecies.evolutions).joinedload(
+                    tb.PokemonEvolution.held_item
+                ),
+            )
+            .order_by(tb.PokemonSpecies.order)
+            .all()
+        )
+        species = {
+            row.id: PokemonSpecies(
+                id=row.id,
+                identifier=row.identifier,
+                gender_rate=row.gender_rate,
+                growth_rate_id=row.growth_rate_id,
+            )
+            for row in species_rows
+        }
+        for row in species_rows:
+            record = species[row.id]
+            if row.evolves_from_species_id is not None:
+                species[row.evolves_from_species_id].child_species.append(
+                    record
+                )
+            for evolution in row.evolutions:
+                record.evolutions.append(
+                    PokemonEvolution(
+                        trigger=_named(evolution.trigger),
+                        minimum_level=evolution.minimum_level,
+                        held_item=_named(evolution.held_item),
+                        time_of_day=evolution.time_of_day,
+                        known_move=moves.get(evolution.known_move_id),
+                        minimum_happiness=evolution.minimum_happiness,
+                        minimum_beauty=evolution.minimum_beauty,
+                        relative_physical_stats=(
+                            evolution.relative_physical_stats
+                        ),
+                        party_species=species.get(evolution.party_species_id),
+                    )
+                )
+
+        pokemon_rows = (
+            session.query(tb.Pokemon)
+            .options(
+                selectinload(tb.Pokemon.forms),
+                selectinload(tb.Pokemon.types),
+                selectinload(tb.Pokemon.stats),
+                selectinload(tb.Pokemon.abilities),
+                selectinload(tb.Pokemon.items).joinedload(tb.PokemonItem.item),
+            )
+            .all()
+        )
+        pokemon = {}
+        for row in pokemon_rows:
+            forms = [
+                PokemonForm(
+                    id=form.id,
+                    identifier=form.identifier,
+                    form_identifier=form.form_identifier,
+                )
+                for form in row.forms
+            ]
+            default_form = next(
+                (
+                    form
+                    for form, form_row in zip(forms, row.forms)
+                    if form_row.is_default
+                ),
+                forms[0] if forms else None,
+            )
+            record = Pokemon(
+                id=row.id,
+                identifier=row.identifier,
+                height=row.height,
+                weight=row.weight,
+                is_default=row.is_default,
+                species=species[row.species_id],
+                default_form=default_form,
+                types=tuple(map(_named, row.types)),
+                stats=tuple(
+                    PokemonStat(base_stat=stat.base_stat, effort=stat.effort)
+                    for stat in row.stats
+                ),
+                abilities=tuple(map(_named, row.abilities)),
+                items=tuple(
+                    PokemonItem(item=_named(item.item), rarity=item.rarity)
+                    for item in row.items
+                ),
+            )
+            for form in forms:
+                if form.form_identifier is not None:
+                    pokemon[row.species_id, form.form_identifier] = record
+            if row.is_default:
+                pokemon[row.species_id, None] = record
+
+        machines = {
+            row.machine_number: Machine(
+                machine_number=row.machine_number, move=moves[row.move_id]
+            )
+            for row in session.query(tb.Machine)
+            .join(tb.VersionGroup)
+            .filter(tb.VersionGroup.identifier == version_group)
+        }
+
+        learnsets = build_learnsets(
+            session.query(tb.PokemonMove)
+            .join(tb.VersionGroup)
+            .filter(tb.VersionGroup.identifier == version_group)
+            .options(joinedload(tb.PokemonMove.method)),
+            moves,
+        )
+
+        return cls(
+            version_group=version_group,
+            pokemon=pokemon,
+            species_ids={row.identifier: row.id for row in species_rows},
+            experience=load_experience_curves(session),
+            genders={
+                row.identifier: _named(row) for row in session.query(tb.Gender)
+            },
+            moves=moves,
+            move_ids={move.identifier: move.id for move in moves.values()},
+            machines=machines,
+            machines_by_move={
+                machine.move.id: machine for machine in machines.values()
+            },
+            learnsets=learnsets,
+        )
+
+    def _national_id(self, national_id: int = None, species: str = None) -> int:
+        """Resolve the National Pokédex ID from either argument."""
+        if species is not None:
+            try:
+                species_id = self.species_ids[species]
+            except KeyError:
+                raise NoResultFound(f'No such species: {species}.')
+            if national_id is not None and national_id != species_id:
+                raise NoResultFound(
+                    f'Inconsistent species ({species}) and National '
+                    f'Pokédex ID ({national_id}).'
+                )
+            return species_id
+        return national_id
+
+    def get_pokemon(
+        self, national_id: int = None, species: str = None, form: str = None
+    ) -> Pokemon:
+        """See ``_database.get_pokemon()``."""
+        key = (self._national_id(national_id, species), form)
+        try:
+            return self.pokemon[key]
+        except KeyError:
+            raise NoResultFound(f'No Pokémon matches {key}.')
+
+    def get_experience_curve(self, growth_rate_id: int) -> ExperienceCurve:
+        """Get the experience curve of a growth rate."""
+        return self.experience[growth_rate_id]
+
+    def get_species_stats(self) -> SpeciesStats:
+        """Get the base stat and EV yield tables of all species, built
+        on first use."""
+        if self._species_stats is None:
+            self._species_stats = SpeciesStats.from_pokemon(
+                (national_id, identifier, self.pokemon[national_id, None].stats)
+                for identifier, national_id in self.species_ids.items()
+            )
+        return self._species_stats
+
+    def get_learnsets(self, pokemon_id: int) -> Dict[str, Learnset]:
+        """Get the learnsets of a Pokémon in ``version_group``, by move
+        method."""
+        return self.learnsets.get(pokemon_id, {})
+
+    def get_gender(self, identifier: str) -> Named:
+        """Get a gender by its identifier."""
+        return self.genders[identifier]
+
+    def get_move(self, move: str = None, move_id: int = None) -> Move:
+        """See ``_database.get_move()``."""
+        if move is not None:
+            if move not in self.move_ids or (
+                move_id is not None and self.move_ids[move] != move_id
+            ):
+                raise NoResultFound(f'No such move: {move}.')
+            move_id = self.move_ids[move]
+        record = self.moves.get(move_id)
+        if record is None or record.generation_id > MOVE_GENERATION:
+            raise NoResultFound(f'No such move: {move_id}.')
+        return record
+
+    def get_machine(
+        self,
+        machine_number: int = None,
+        move_identifier: str = None,
+        move_id: int = None,
+    ) -> Optional[Machine]:
+        """See ``_database.get_machine()``."""
+        if move_identifier is not None:
+            if move_identifier not in self.move_ids:
+                return None
+            if (
+                move_id is not None
+                and move_id != self.move_ids[move_identifier]
+            ):
+                return None
+            move_id = self.move_ids[move_identifier]
+        if machine_number is not None:
+            machine = self.machines.get(machine_number)
+            if machine is None or (
+                move_id is not None and machine.move.id != move_id
+            ):
+                return None
+            return machine
+        return self.machines_by_move.get(move_id)
@@ -0,0 +1,181 @@
+"""Asyncio counterparts of ``Pokemon`` and the query helpers.
+
+SQLAlchemy sessions block, so the coroutines here run the synchronous
+code on a shared thread pool. The number of worker threads bounds how
+many queries run at once, however many coroutines are awaiting them.
+Each worker thread queries through its own session, so rows returned
+by the query helpers belong to that thread's session. The helpers load
+the relationships of the rows they return in the worker, e.g. the
+species, types, and stats of a ``pokedex.db.tables.Pokemon``. Only
+those are loaded: going further, e.g. ``pokemon.species.evolutions``,
+from the event loop would block it on a lazy loading query, in a
+session another thread may be using. Read such attributes in the
+worker, with ``run()``, or load a snapshot, whose records have no lazy
+relationships.
+
+When a snapshot or a data pack is loaded, the helpers it serves run
+right away on the event loop thread. Helpers reading a version group
+other than the snapshot's still query the database, on the pool.
+
+Usage::
+
+    >>> import pokemaster.aio
+    >>> eevee = await pokemaster.aio.create_pokemon(species='eevee')
+"""
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import sqlalchemy
+import sqlalchemy.orm.state
+
+from pokemaster import _database
+from pokemaster.pokemon import Pokemon
+
+#: The default number of threads running database work. Each one keeps
+#: a database connection.
+MAX_WORKERS = 8
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+_max_workers = MAX_WORKERS
+
+
+def configure(max_workers: int = MAX_WORKERS) -> None:
+    """Set the number of threads running database work.
+
+    The current thread pool finishes its pending work in the background
+    and a new one is started on next use.
+    """
+    global _EXECUTOR, _max_workers
+    if max_workers < 1:
+        raise ValueError(f'`max_workers` must be positive, got {max_workers}.')
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+        _max_workers = max_workers
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def shutdown() -> None:
+    """Stop the thread pool after its pending work is done."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_max_workers,
+                    thread_name_prefix='pokemaster-aio',
+                )
+    return _EXECUTOR
+
+
+async def run(func: Callable, *args, **kwargs) -> Any:
+    """Call a blocking function of ``pokemaster`` without blocking the
+    event loop.
+
+    ``func`` always runs on the thread pool, as it may do anything.
+
+    :param func: The function to call with ``args`` and ``kwargs``.
+    :return: The return value of ``func``.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        _executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def _served_by_snapshot(version_group: Optional[str] = None) -> bool:
+    """Check if a snapshot is loaded, with the learnsets of
+    ``version_group`` if given."""
+    snapshot = _database._SNAPSHOT
+    return snapshot is not None and (
+        version_group is None or version_group == snapshot.version_group
+    )
+
+
+async def create_pokemon(*args, **kwargs) -> Pokemon:
+    """Create a ``Pokemon``. Takes the same arguments as ``Pokemon``."""
+    # Pokémon learn their moves from the emerald learnsets.
+    if _served_by_snapshot('emerald'):
+        return Pokemon(*args, **kwargs)
+    return await run(Pokemon, *args, **kwargs)
+
+
+def _load_relationships(result: Any) -> Any:
+    """Load the relationships of the ORM rows in ``result``, a row or a
+    sequence of rows, so that reading them makes no query."""
+    rows = result if isinstance(result, (list, tuple)) else [result]
+    for row in rows:
+        state = sqlalchemy.inspect(row, raiseerr=False)
+        if isinstance(state, sqlalchemy.orm.state.InstanceState):
+            for relationship in state.mapper.relationships:
+                getattr(row, relationship.key)
+    return result
+
+
+def _loaded(func: Callable) -> Callable:
+    """Wrap ``func`` to load the relationships of the rows it returns."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _load_relationships(func(*args, **kwargs))
+
+    return wrapper
+
+
+def _async(func: Callable, learnsets: bool = False) -> Callable:
+    """Make an async counterpart of a query helper.
+
+    :param func: The query helper.
+    :param learnsets: True if ``func`` reads the learnsets of its
+        ``version_group`` argument.
+    """
+    signature = inspect.signature(func)
+    loaded = _loaded(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        version_group = None
+        if learnsets:
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            version_group = arguments.arguments['version_group']
+        if _served_by_snapshot(version_group):
+            return func(*args, **kwargs)
+        return await run(loaded, *args, **kwargs)
+
+    wrapper.__doc__ = f'Async ``_database.{func.__name__}()``.'
+    return wrapper
+
+
+get_pokemon = _async(_database.get_pokemon)
+get_pokemon_many = _async(_database.get_pokemon_many)
+get_experience = _async(_database.get_experience)
+get_experience_many = _async(_database.get_experience_many)
+get_experience_curve = _async(_database.get_experience_curve)
+get_species_stats = _async(_database.get_species_stats)
+wild_pokemon_held_item = _async(_database.wild_pokemon_held_item)
+get_learnset = _async(_database.get_learnset, learnsets=True)
+get_pokemon_default_moves = _async(
+    _database.get_pokemon_default_moves, learnsets=True
+)
+get_nature = _async(_database.get_nature)
+get_nature_many = _async(_database.get_nature_many)
+get_ability = _async(_database.get_ability)
+get_pokemon_gender = _async(_database.get_pokemon_gender)
+get_move = _async(_database.get_move)
+get_machine = _async(_database.get_machine)
+get_move_pool = _async(_database.get_move_pool, learnsets=True)
+can_learn_move = _async(_database.can_learn_move, learnsets=True)
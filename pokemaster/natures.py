@@ -0,0 +1,169 @@
+"""The 25 natures, as constants.
+
+A Pokémon's nature is its personality value modulo 25, the game index
+of the nature. The nature of game index i raises the stat i // 5 and
+lowers the stat i % 5, in the order of ``AFFECTED_STATS``. It is
+neutral if both are the same.
+
+Nothing here touches the database: the pokedex data of natures never
+changes.
+"""
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm.exc import NoResultFound
+
+from pokemaster._snapshot import Named, Nature
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional.
+    np = None
+
+#: The nature identifiers, in the order of their game indices.
+NATURES = (
+    'hardy',
+    'lonely',
+    'brave',
+    'adamant',
+    'naughty',
+    'bold',
+    'docile',
+    'relaxed',
+    'impish',
+    'lax',
+    'timid',
+    'hasty',
+    'serious',
+    'jolly',
+    'naive',
+    'modest',
+    'mild',
+    'quiet',
+    'bashful',
+    'rash',
+    'calm',
+    'gentle',
+    'sassy',
+    'careful',
+    'quirky',
+)
+
+#: Nature identifier -> game index.
+GAME_INDICES: Dict[str, int] = {
+    identifier: game_index for game_index, identifier in enumerate(NATURES)
+}
+
+#: The stats a nature can raise or lower, in the order of the game
+#: indices, with their pokedex IDs.
+AFFECTED_STATS = (
+    Named(2, 'attack'),
+    Named(3, 'defense'),
+    Named(6, 'speed'),
+    Named(4, 'special-attack'),
+    Named(5, 'special-defense'),
+)
+
+#: The order of the stats in ``Stats``.
+_STATS = (
+    'hp',
+    'attack',
+    'defense',
+    'special_attack',
+    'special_defense',
+    'speed',
+)
+
+
+def _modifiers(game_index: int) -> tuple:
+    increased, decreased = divmod(game_index, 5)
+    modifiers = [1] * len(_STATS)
+    if increased != decreased:
+        stat = AFFECTED_STATS[increased].identifier.replace('-', '_')
+        modifiers[_STATS.index(stat)] = 1.1
+        stat = AFFECTED_STATS[decreased].identifier.replace('-', '_')
+        modifiers[_STATS.index(stat)] = 0.9
+    return tuple(modifiers)
+
+
+#: The 25×6 stat modifiers, by game index, in the order of ``Stats``.
+#: Unaffected stats are the integer 1.
+MODIFIERS: Tuple[tuple, ...] = tuple(map(_modifiers, range(len(NATURES))))
+
+#: The pokedex IDs of the natures, in the order of their game indices.
+#: The pokedex numbers them by the stat they lower, then by the stat
+#: they raise, in the order of the pokedex stat IDs.
+IDS = (
+    1,
+    6,
+    21,
+    11,
+    16,
+    2,
+    7,
+    22,
+    12,
+    17,
+    5,
+    10,
+    25,
+    15,
+    20,
+    3,
+    8,
+    23,
+    13,
+    18,
+    4,
+    9,
+    24,
+    14,
+    19,
+)
+
+#: The nature records, by game index.
+RECORDS: Tuple[Nature, ...] = tuple(
+    Nature(
+        id=IDS[game_index],
+        identifier=identifier,
+        game_index=game_index,
+        is_neutral=game_index // 5 == game_index % 5,
+        increased_stat=AFFECTED_STATS[game_index // 5],
+        decreased_stat=AFFECTED_STATS[game_index % 5],
+    )
+    for game_index, identifier in enumerate(NATURES)
+)
+
+_MODIFIER_ARRAY = None
+
+
+def get_nature(
+    game_index: Optional[int] = None, identifier: Optional[str] = None
+) -> Nature:
+    """Get a nature by its game index and/or identifier.
+
+    :raise NoResultFound: if no nature matches.
+    """
+    if identifier is not None:
+        found = GAME_INDICES.get(identifier)
+        if found is None or game_index not in (None, found):
+            raise NoResultFound(f'No such nature: {identifier}.')
+        game_index = found
+    if game_index is None or not 0 <= game_index < len(RECORDS):
+        raise NoResultFound(f'No such nature: {game_index}.')
+    return RECORDS[game_index]
+
+
+def modifier_array() -> 'np.ndarray':
+    """``MODIFIERS`` as a read-only 25×6 NumPy array of floats.
+
+    Index it with personality values modulo 25 to get the modifiers of
+    many Pokémon at once. Requires NumPy.
+    """
+    global _MODIFIER_ARRAY
+    if _MODIFIER_ARRAY is None:
+        if np is None:
+            raise ImportError('`modifier_array` requires NumPy.')
+        array = np.array(MODIFIERS, dtype=np.float64)
+        array.flags.writeable = False
+        _MODIFIER_ARRAY = array
+    return _MODIFIER_ARRAY
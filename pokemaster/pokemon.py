@@ -39,6 +39,7 @@ class Pokemon:
         ability: str = None,
         nature: str = None,
         iv: Stats = None,
+        prng: PRNG = None,
     ):
         """Instantiate a Pokémon.
 
@@ -77,6 +78,10 @@ class Pokemon:
             special-defense, speed). Each individual value must not
             exceed 32. If it is not specified, a random set of IV's will
             be generated using the PRNG.
+        :param PRNG prng: The generator of the personality ID and IV's.
+            Defaults to one shared by all the ``Pokemon`` instances.
+            Pass a substream (see ``PRNG.substream()``) to generate
+            Pokémon reproducibly across threads or processes.
         """
         _pokemon = _database.get_pokemon(
             national_id=national_id, species=species, form=form
@@ -84,6 +89,9 @@ class Pokemon:
         _growth = _database.get_experience(
             national_id=national_id, species=species, level=level, exp=exp
         )
+        self._experience_curve = _database.get_experience_curve(
+            national_id=national_id, species=species
+        )
 
         _species = _pokemon.species
         self._national_id = _species.id
@@ -98,6 +106,8 @@ class Pokemon:
         self._exp = _growth.experience if exp is None else exp
         self._happiness = 0
 
+        if prng is not None:
+            self._prng = prng
         if iv is None:
             _gene = self._prng.create_gene()
             self._iv = Stats.make_iv(_gene)
@@ -157,9 +167,7 @@ class Pokemon:
         """The experience points needed to get to the next level."""
         if self._level < 100:
             return (
-                _database.get_experience(
-                    species=self._species, level=self._level + 1
-                ).experience
+                self._experience_curve.experience_at(self._level + 1)
                 - self._exp
             )
         else:
@@ -220,23 +228,13 @@ class Pokemon:
 
     def _calculate_stats(self) -> Stats:
         """Calculate the Pokémon's stats."""
-        residual_stats = Stats(
-            hp=10 + self._level,
-            attack=5,
-            defense=5,
-            special_attack=5,
-            special_defense=5,
-            speed=5,
+        return Stats.make_permanent_stats(
+            self._species_strengths,
+            self._iv,
+            self._ev,
+            self._level,
+            self._nature_modifiers,
         )
-        stats = (
-            (self._species_strengths * 2 + self._iv + self._ev // 4)
-            * self._level
-            // 100
-            + residual_stats
-        ) * self._nature_modifiers
-        if self._species_strengths.hp == 1:
-            stats.hp = 1
-        return stats
 
     def _check_evolution_condition(
         self, trigger: str, evolution: tb.PokemonEvolution
@@ -315,6 +313,9 @@ class Pokemon:
         )
         self._stats = self._calculate_stats()
         self._weight = evolved_pokemon.weight
+        self._experience_curve = _database.get_experience_curve(
+            species=self._species
+        )
 
     def gain_exp(self, earned_exp: int) -> NoReturn:
         """Add ``earned_exp`` to the Pokémon's exp. points.
@@ -378,10 +379,9 @@ class Pokemon:
         elif len(self._moves) == 4:
             self._moves.remove(forget)
 
-        move_pool = _database.get_move_pool(
-            species=self._species, move_method=move_method
-        )
-        if learn in map(lambda x: x.move.identifier, move_pool):
+        if _database.can_learn_move(
+            learn, species=self._species, move_method=move_method
+        ):
             self._moves.append(learn)
         else:
             raise ValueError(f'{self._species} cannot learn move {learn}!')
@@ -411,9 +411,7 @@ class Pokemon:
             return
 
         self._level += 1
-        self._exp = _database.get_experience(
-            species=self._species, level=self._level
-        ).experience
+        self._exp = self._experience_curve.experience_at(self._level)
         self._stats = self._calculate_stats()
         if self.held_item and self.held_item == 'everstone':
             return
@@ -1,15 +1,105 @@
 """Provides the pseudo-random number generator used in various
 places."""
+import random
 from numbers import Real
 from typing import List, Tuple, Union
 
 import attr
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional.
+    np = None
+
+#: The Gen. 3 LCG: seed' = (MULTIPLIER * seed + INCREMENT) mod 2**32.
+MULTIPLIER = 0x41C64E6D
+INCREMENT = 0x6073
+#: The inverse LCG: seed = (INVERSE_MULTIPLIER * seed' + INVERSE_INCREMENT)
+#: mod 2**32.
+INVERSE_MULTIPLIER = 0xEEB9EB65
+INVERSE_INCREMENT = 0x0A3561A1
+#: The period of the LCG.
+PERIOD = 1 << 32
+
+#: The Gen. 5 LCG: seed' = (MULTIPLIER_64 * seed + INCREMENT_64) mod 2**64.
+MULTIPLIER_64 = 0x5D588B656C078965
+INCREMENT_64 = 0x269EC3
+INVERSE_MULTIPLIER_64 = 0xDEDCEDAE9638806D
+INVERSE_INCREMENT_64 = 0x9B1AE6E9A384E6F9
+PERIOD_64 = 1 << 64
+
+#: The generations whose main generator is the 32-bit LCG.
+LCG_GENERATIONS = (3, 4)
+
+#: The default number of random numbers in a substream. The period
+#: holds 2**32 / SUBSTREAM_LENGTH = 4096 of them.
+SUBSTREAM_LENGTH = 1 << 20
+
+#: The number of outputs computed per vectorized step.
+BLOCK_SIZE = 4096
+
+_JUMP_TABLES = {}
+
+
+def _affine_power(
+    mult: int, add: int, n: int, mask: int = 0xFFFFFFFF
+) -> Tuple[int, int]:
+    """Compose the map seed -> mult * seed + add (mod mask + 1) with
+    itself n times, by squaring, and return the coefficients of the
+    result."""
+    result_mult, result_add = 1, 0
+    while n:
+        if n & 1:
+            result_mult = (result_mult * mult) & mask
+            result_add = (result_add * mult + add) & mask
+        add = (add * (mult + 1)) & mask
+        mult = (mult * mult) & mask
+        n >>= 1
+    return result_mult, result_add
+
+
+def _jump_table(
+    multiplier: int = MULTIPLIER, increment: int = INCREMENT
+) -> Tuple['np.ndarray', 'np.ndarray']:
+    """The coefficients (A^k, C_k) that advance a seed by k steps at
+    once, seed_k = A^k * seed + C_k, for k in 1 .. ``BLOCK_SIZE``.
+
+    They are built by doubling: k + L steps are L steps after k. uint64
+    wraps modulo 2**64, which keeps them exact for both the 32-bit and
+    the 64-bit LCG; the 32-bit ones are masked down.
+    """
+    table = _JUMP_TABLES.get(multiplier)
+    if table is None:
+        if np is None:
+            raise ImportError(
+                'Batch generation requires NumPy: pip install numpy'
+            )
+        mask = np.uint64(0xFFFFFFFF if multiplier < PERIOD else PERIOD_64 - 1)
+        mult = np.array([multiplier], dtype=np.uint64)
+        add = np.array([increment], dtype=np.uint64)
+        while len(mult) < BLOCK_SIZE:
+            mult_l, add_l = mult[-1], add[-1]
+            mult = np.concatenate([mult, (mult * mult_l) & mask])
+            add = np.concatenate([add, (mult_l * add + add_l) & mask])
+        table = _JUMP_TABLES[multiplier] = (
+            mult[:BLOCK_SIZE],
+            add[:BLOCK_SIZE],
+        )
+    return table
+
+
+def _unsupported(gen: int) -> ValueError:
+    if gen == 5:
+        return ValueError('Use `PRNG64` for the Gen. 5 PRNG.')
+    return ValueError(f'Gen. {gen} PRNG is not supported yet.')
+
 
 @attr.s(slots=True, auto_attribs=True, cmp=False)
 class PRNG:
     """A linear congruential random number generator.
 
+    This is the main generator of Gen. 3 and 4. See ``PRNG64`` for Gen. 5.
+
     Usage::
 
         >>> prng = PRNG()
@@ -36,20 +126,12 @@ class PRNG:
     def __attrs_post_init__(self):
         self._initial_seed = self._seed
 
-    def _generator(self):
-        if self._gen == 3:
-            while True:
-                self._seed = (0x41C64E6D * self._seed + 0x6073) & 0xFFFFFFFF
-                yield self._seed >> 16
-        else:
-            return ValueError(f"Gen. {self._gen} PRNG is not supported yet.")
-
     def __call__(self) -> int:
-        try:
-            return next(self._generator())
-        except StopIteration:
-            self.reset()
-            return next(self._generator())
+        if self._gen not in LCG_GENERATIONS:
+            raise _unsupported(self._gen)
+        # MULTIPLIER and INCREMENT, inlined to spare two global lookups.
+        self._seed = seed = (0x41C64E6D * self._seed + 0x6073) & 0xFFFFFFFF
+        return seed >> 16
 
     def reset(self):
         """Reset the generator with the initial seed."""
@@ -59,8 +141,117 @@ class PRNG:
         """Generate the next n random numbers."""
         if n == 1:
             return self()
+        if self._gen not in LCG_GENERATIONS:
+            raise _unsupported(self._gen)
+        seed = self._seed
+        numbers = []
+        append = numbers.append
+        for _ in range(n):
+            seed = (0x41C64E6D * seed + 0x6073) & 0xFFFFFFFF
+            append(seed >> 16)
+        self._seed = seed
+        return numbers
+
+    @property
+    def seed(self) -> int:
+        """The current state of the generator."""
+        return self._seed
+
+    def advance(self, n: int) -> None:
+        """Skip n random numbers, in O(log n) time. A negative n rewinds
+        the generator."""
+        if self._gen not in LCG_GENERATIONS:
+            raise _unsupported(self._gen)
+        if n < 0:
+            mult, add = _affine_power(
+                INVERSE_MULTIPLIER, INVERSE_INCREMENT, -n % PERIOD
+            )
         else:
-            return [self() for _ in range(n)]
+            mult, add = _affine_power(MULTIPLIER, INCREMENT, n % PERIOD)
+        self._seed = (mult * self._seed + add) & 0xFFFFFFFF
+
+    def rewind(self, n: int) -> None:
+        """Undo the last n random numbers, in O(log n) time."""
+        self.advance(-n)
+
+    def distance(self, seed_a: int, seed_b: int) -> int:
+        """The number of random numbers it takes to go from ``seed_a``
+        to ``seed_b``, between 0 and 2**32 - 1.
+
+        Jumping 2**i steps ahead changes bit i of the seed and keeps the
+        lower bits, so the distance is found one bit at a time.
+        """
+        if self._gen not in LCG_GENERATIONS:
+            raise _unsupported(self._gen)
+        seed_a &= 0xFFFFFFFF
+        seed_b &= 0xFFFFFFFF
+        mult, add = MULTIPLIER, INCREMENT
+        distance = 0
+        bit = 1
+        while seed_a != seed_b:
+            if (seed_a ^ seed_b) & bit:
+                seed_a = (mult * seed_a + add) & 0xFFFFFFFF
+                distance |= bit
+            add = (add * (mult + 1)) & 0xFFFFFFFF
+            mult = (mult * mult) & 0xFFFFFFFF
+            bit <<= 1
+        return distance
+
+    def substream(self, index: int, length: int = SUBSTREAM_LENGTH) -> 'PRNG':
+        """A new generator for the ``index``-th block of ``length``
+        random numbers after the current state. This generator is not
+        advanced.
+
+        Substreams of different indices never overlap as long as each
+        one draws at most ``length`` numbers.
+        """
+        if not 0 <= index < PERIOD // length:
+            raise ValueError(
+                f'`index` must be in [0, {PERIOD // length}), got {index}.'
+            )
+        prng = PRNG(self._seed, gen=self._gen)
+        prng.advance(index * length)
+        prng._initial_seed = prng._seed
+        return prng
+
+    def split(self, n: int, length: int = SUBSTREAM_LENGTH) -> List['PRNG']:
+        """The first n substreams. See ``substream()``."""
+        return [self.substream(index, length) for index in range(n)]
+
+    def twister(self) -> 'MersenneTwister':
+        """The Mersenne Twister that Gen. 4 seeds along with this
+        generator, with the same initial seed."""
+        return MersenneTwister(self._initial_seed)
+
+    def next_seeds(self, n: int) -> 'np.ndarray':
+        """Advance the generator by n steps at once, and return the n
+        seeds it goes through, as a NumPy ``uint32`` array.
+
+        The result and the final state are the same as calling the
+        generator n times. Requires NumPy.
+        """
+        if self._gen not in LCG_GENERATIONS:
+            raise _unsupported(self._gen)
+        if n < 0:
+            raise ValueError(f'`n` must be non-negative, got {n}.')
+        mult, add = _jump_table()
+        seeds = np.empty(n, dtype=np.uint64)
+        seed = np.uint64(self._seed & 0xFFFFFFFF)
+        for start in range(0, n, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, n)
+            block = seeds[start:stop]
+            np.multiply(mult[: stop - start], seed, out=block)
+            block += add[: stop - start]
+            block &= 0xFFFFFFFF
+            seed = block[-1]
+        if n:
+            self._seed = int(seed)
+        return seeds.astype(np.uint32)
+
+    def next_array(self, n: int) -> 'np.ndarray':
+        """Generate the next n random numbers as a NumPy ``uint16``
+        array. See ``next_seeds()``."""
+        return (self.next_seeds(n) >> 16).astype(np.uint16)
 
     def create_genome(self, method=2) -> Tuple[int, int]:
         """Generate the PID and IVs using the internal generator. Return
@@ -79,8 +270,8 @@ class PRNG:
 
         :return: int
         """
-        pid_src_1, pid_src_2 = self.next(2)
-        return pid_src_1 + (pid_src_2 << 16)
+        low = self()
+        return low + (self() << 16)
 
     def create_gene(self, method: int = 2) -> int:
         """Create the number used to generate a Pokémon's IVs.
@@ -97,18 +288,23 @@ class PRNG:
                 ' for help.'
             )
         elif method == 1:
-            iv_src_1, iv_src_2 = self.next(2)
+            iv_src_1 = self()
+            iv_src_2 = self()
         elif method == 2:
-            _, iv_src_1, iv_src_2 = self.next(3)
+            self()
+            iv_src_1 = self()
+            iv_src_2 = self()
         else:  # method == 4:
-            iv_src_1, _, iv_src_2 = self.next(3)
+            iv_src_1 = self()
+            self()
+            iv_src_2 = self()
 
         return iv_src_1 + (iv_src_2 << 16)
 
     def random(self) -> float:
         """Return a random number from the uniform distribution [0,
         1)."""
-        return self.next() / 0x10000
+        return self() / 0x10000
 
     def uniform(
         self, min: Union[int, float] = None, max: Union[int, float] = None
@@ -141,3 +337,294 @@ class PRNG:
             if max <= min:
                 raise ValueError("'max' must be strictly greater than 'min'.")
             return self.random() * (max - min) + min
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class PRNG64:
+    """The 64-bit linear congruential generator of Gen. 5.
+
+    It has the same interface as ``PRNG``, but each call returns the
+    upper 32 bits of the new seed.
+
+    Usage::
+
+        >>> prng = PRNG64(seed=0x1A56B091)
+        >>> hex(prng())
+        '0xe007bd33'
+    """
+
+    _seed: int = attr.ib(validator=attr.validators.instance_of(int), default=0)
+    _initial_seed: int = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        self._initial_seed = self._seed
+
+    def __call__(self) -> int:
+        self._seed = seed = (
+            0x5D588B656C078965 * self._seed + 0x269EC3
+        ) & 0xFFFFFFFFFFFFFFFF
+        return seed >> 32
+
+    def reset(self):
+        """Reset the generator with the initial seed."""
+        self._seed = self._initial_seed
+
+    def next(self, n=1) -> Union[int, List[int]]:
+        """Generate the next n random numbers."""
+        if n == 1:
+            return self()
+        seed = self._seed
+        numbers = []
+        append = numbers.append
+        for _ in range(n):
+            seed = (0x5D588B656C078965 * seed + 0x269EC3) & 0xFFFFFFFFFFFFFFFF
+            append(seed >> 32)
+        self._seed = seed
+        return numbers
+
+    @property
+    def seed(self) -> int:
+        """The current state of the generator."""
+        return self._seed
+
+    def advance(self, n: int) -> None:
+        """Skip n random numbers, in O(log n) time. A negative n rewinds
+        the generator."""
+        if n < 0:
+            mult, add = _affine_power(
+                INVERSE_MULTIPLIER_64,
+                INVERSE_INCREMENT_64,
+                -n % PERIOD_64,
+                PERIOD_64 - 1,
+            )
+        else:
+            mult, add = _affine_power(
+                MULTIPLIER_64, INCREMENT_64, n % PERIOD_64, PERIOD_64 - 1
+            )
+        self._seed = (mult * self._seed + add) & (PERIOD_64 - 1)
+
+    def rewind(self, n: int) -> None:
+        """Undo the last n random numbers, in O(log n) time."""
+        self.advance(-n)
+
+    def distance(self, seed_a: int, seed_b: int) -> int:
+        """The number of random numbers it takes to go from ``seed_a``
+        to ``seed_b``, between 0 and 2**64 - 1. See
+        ``PRNG.distance()``."""
+        mask = PERIOD_64 - 1
+        seed_a &= mask
+        seed_b &= mask
+        mult, add = MULTIPLIER_64, INCREMENT_64
+        distance = 0
+        bit = 1
+        while seed_a != seed_b:
+            if (seed_a ^ seed_b) & bit:
+                seed_a = (mult * seed_a + add) & mask
+                distance |= bit
+            add = (add * (mult + 1)) & mask
+            mult = (mult * mult) & mask
+            bit <<= 1
+        return distance
+
+    def substream(self, index: int, length: int = SUBSTREAM_LENGTH) -> 'PRNG64':
+        """A new generator for the ``index``-th block of ``length``
+        random numbers after the current state. See
+        ``PRNG.substream()``."""
+        if not 0 <= index < PERIOD_64 // length:
+            raise ValueError(
+                f'`index` must be in [0, {PERIOD_64 // length}), got {index}.'
+            )
+        prng = PRNG64(self._seed)
+        prng.advance(index * length)
+        prng._initial_seed = prng._seed
+        return prng
+
+    def split(self, n: int, length: int = SUBSTREAM_LENGTH) -> List['PRNG64']:
+        """The first n substreams. See ``substream()``."""
+        return [self.substream(index, length) for index in range(n)]
+
+    def twister(self) -> 'MersenneTwister':
+        """The Mersenne Twister that Gen. 5 seeds with the upper 32 bits
+        of the initial seed, and draws the IV's from."""
+        return MersenneTwister(self._initial_seed >> 32)
+
+    def next_seeds(self, n: int) -> 'np.ndarray':
+        """Advance the generator by n steps at once, and return the n
+        seeds it goes through, as a NumPy ``uint64`` array. See
+        ``PRNG.next_seeds()``."""
+        if n < 0:
+            raise ValueError(f'`n` must be non-negative, got {n}.')
+        mult, add = _jump_table(MULTIPLIER_64, INCREMENT_64)
+        seeds = np.empty(n, dtype=np.uint64)
+        seed = np.uint64(self._seed & (PERIOD_64 - 1))
+        for start in range(0, n, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, n)
+            block = seeds[start:stop]
+            # uint64 arithmetic wraps modulo 2**64, the modulus itself.
+            np.multiply(mult[: stop - start], seed, out=block)
+            block += add[: stop - start]
+            seed = block[-1]
+        if n:
+            self._seed = int(seed)
+        return seeds
+
+    def next_array(self, n: int) -> 'np.ndarray':
+        """Generate the next n random numbers as a NumPy ``uint32``
+        array. See ``next_seeds()``."""
+        return (self.next_seeds(n) >> np.uint64(32)).astype(np.uint32)
+
+    def random(self) -> float:
+        """Return a random number from the uniform distribution [0,
+        1)."""
+        return self() / 0x100000000
+
+    uniform = PRNG.uniform
+
+
+#: The parameters of MT19937.
+_MT_SIZE = 624
+_MT_INIT_MULTIPLIER = 1812433253
+#: Random numbers skipped at once by ``MersenneTwister.advance()``.
+_MT_SKIP = 1 << 16
+
+
+@attr.s(slots=True, auto_attribs=True, cmp=False)
+class MersenneTwister:
+    """The MT19937 Mersenne Twister of Gen. 4 and 5.
+
+    It is seeded the way the games do, with a 32-bit seed, then runs on
+    ``random.Random``, the C implementation of MT19937 in the standard
+    library. Each call returns 32 bits.
+
+    Usage::
+
+        >>> mt = MersenneTwister(seed=5489)
+        >>> mt()
+        3499211612
+    """
+
+    _seed: int = attr.ib(validator=attr.validators.instance_of(int), default=0)
+    _random: random.Random = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.reset()
+
+    def __call__(self) -> int:
+        return self._random.getrandbits(32)
+
+    def reset(self):
+        """Reset the generator with the initial seed."""
+        state = [self._seed & 0xFFFFFFFF]
+        for i in range(1, _MT_SIZE):
+            previous = state[-1]
+            state.append(
+                (_MT_INIT_MULTIPLIER * (previous ^ (previous >> 30)) + i)
+                & 0xFFFFFFFF
+            )
+        # Version 3 states end with the position in the state vector; at
+        # the end of it, the next call twists first, as after seeding.
+        self._random = random.Random()
+        self._random.setstate((3, tuple(state) + (_MT_SIZE,), None))
+
+    def next(self, n=1) -> Union[int, List[int]]:
+        """Generate the next n random numbers."""
+        if n == 1:
+            return self()
+        getrandbits = self._random.getrandbits
+        return [getrandbits(32) for _ in range(n)]
+
+    @property
+    def seed(self) -> int:
+        """The initial seed of the generator."""
+        return self._seed
+
+    def advance(self, n: int) -> None:
+        """Skip n random numbers. The Mersenne Twister has no cheap
+        jump-ahead, so this takes O(n) time, at C speed."""
+        if n < 0:
+            raise ValueError('The Mersenne Twister cannot be rewound.')
+        getrandbits = self._random.getrandbits
+        while n > 0:
+            getrandbits(32 * min(n, _MT_SKIP))
+            n -= _MT_SKIP
+
+    def next_array(self, n: int) -> 'np.ndarray':
+        """Generate the next n random numbers as a NumPy ``uint32``
+        array. The result and the final state are the same as calling
+        the generator n times. Requires NumPy."""
+        if np is None:
+            raise ImportError(
+                'Batch generation requires NumPy: pip install numpy'
+            )
+        if n < 0:
+            raise ValueError(f'`n` must be non-negative, got {n}.')
+        if not n:
+            return np.empty(0, dtype=np.uint32)
+        # getrandbits() packs consecutive outputs from the least
+        # significant 32 bits up.
+        bits = self._random.getrandbits(32 * n)
+        return np.frombuffer(bits.to_bytes(4 * n, 'little'), dtype='<u4')
+
+    def create_ivs(self) -> Tuple[int, int, int, int, int, int]:
+        """Draw the six IV's the Gen. 5 way, each from the top 5 bits
+        of a random number.
+
+        :return: The IV's, in the order of ``Stats``: hp, attack,
+            defense, special attack, special defense, speed.
+        """
+        getrandbits = self._random.getrandbits
+        return tuple(getrandbits(32) >> 27 for _ in range(6))
+
+    def random(self) -> float:
+        """Return a random number from the uniform distribution [0,
+        1)."""
+        return self() / 0x100000000
+
+    uniform = PRNG.uniform
+
+
+def for_generation(gen: int, seed: int = 0) -> Union[PRNG, PRNG64]:
+    """Create the main generator of a generation.
+
+    :param gen: The generation: 3, 4, or 5.
+    :param seed: The initial seed.
+    :return: A ``PRNG`` for Gen. 3 and 4, or a ``PRNG64`` for Gen. 5.
+    """
+    if gen in LCG_GENERATIONS:
+        return PRNG(seed, gen=gen)
+    if gen == 5:
+        return PRNG64(seed)
+    raise ValueError(f'Gen. {gen} PRNG is not supported yet.')
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class PRNGFactory:
+    """Hand out non-overlapping, reproducible substreams of one seed.
+
+    Give each task the substream of its own index, rather than one per
+    thread or process, and the results do not depend on how many
+    workers run the tasks. The factory is picklable, so it can be sent
+    to worker processes.
+
+    Usage::
+
+        >>> factory = PRNGFactory(seed=0x1A56B091)
+        >>> with ProcessPoolExecutor() as executor:
+        ...     executor.map(task, range(100), [factory(i) for i in range(100)])
+
+    :param seed: The seed of the whole stream.
+    :param length: The number of random numbers in a substream.
+    """
+
+    seed: int = 0
+    length: int = SUBSTREAM_LENGTH
+    gen: int = 3
+
+    def __call__(self, index: int) -> Union[PRNG, PRNG64]:
+        """A new generator for the ``index``-th substream."""
+        return for_generation(self.gen, self.seed).substream(index, self.length)
+
+    def __len__(self) -> int:
+        """The number of substreams."""
+        period = PERIOD_64 if self.gen == 5 else PERIOD
+        return period // self.length
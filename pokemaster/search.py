@@ -0,0 +1,331 @@
+"""Search seeds and frames for the Pokémon a ``PRNG`` can generate.
+
+A search takes ``Criteria`` on the PID (nature, ability slot,
+shininess) and on the IVs. It evaluates them on whole chunks of seeds
+or frames at once with NumPy, and spreads the chunks over a process
+pool. Requires NumPy.
+
+Usage::
+
+    >>> criteria = Criteria(natures={'adamant'}, ivs={'attack': (30, 31)})
+    >>> for match in search(criteria, seeds=[0x1A56B091], frames=range(10000)):
+    ...     print(match.frame, match.nature)
+
+A frame is the number of random numbers drawn before the genome, i.e.
+``PRNG(match.seed)`` advanced by ``match.frame`` steps then
+``create_genome(match.method)`` yields ``(match.pid, match.gene)``.
+"""
+import concurrent.futures
+import itertools
+import os
+from typing import (
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import attr
+
+from pokemaster.natures import GAME_INDICES, NATURES
+from pokemaster.prng import (
+    INCREMENT,
+    INVERSE_INCREMENT,
+    INVERSE_MULTIPLIER,
+    MULTIPLIER,
+    PRNG,
+    _affine_power,
+    np,
+)
+from pokemaster.stats import Stats
+
+#: The random numbers, counted from 1 after the seed, that make up the
+#: two halves of the gene, by method. See ``PRNG.create_gene()``.
+IV_CALLS = {1: (3, 4), 2: (4, 5), 4: (3, 5)}
+
+#: The bit offset of each IV in the gene. See ``Stats.make_iv()``.
+IV_SHIFTS = {
+    'hp': 0,
+    'attack': 5,
+    'defense': 10,
+    'speed': 16,
+    'special_attack': 21,
+    'special_defense': 26,
+}
+
+#: Seeds or frames evaluated at once by a worker.
+CHUNK_SIZE = 1 << 16
+
+
+def _iv_ranges(ivs: Mapping[str, Union[int, Tuple[int, int]]]) -> tuple:
+    ranges = []
+    for stat, value in sorted(ivs.items()):
+        if stat not in IV_SHIFTS:
+            raise ValueError(f'Unknown stat: {stat}.')
+        low, high = (value, value) if isinstance(value, int) else value
+        ranges.append((stat, low, high))
+    return tuple(ranges)
+
+
+def _natures(natures: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    if natures is None:
+        return None
+    natures = frozenset(natures)
+    unknown = natures - GAME_INDICES.keys()
+    if unknown:
+        raise ValueError(f'Unknown natures: {sorted(unknown)}.')
+    return natures
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class Criteria:
+    """What a generated Pokémon must look like.
+
+    :param natures: The acceptable nature identifiers. Any nature if
+        None.
+    :param ivs: Stat name -> exact IV, or (min, max) IV. Stats not
+        mentioned can have any IV.
+    :param ability: The ability slot, 0 or 1 (the lowest PID bit).
+    :param shiny: Require a shiny Pokémon for ``trainer_id`` and
+        ``secret_id``.
+    """
+
+    natures: Optional[FrozenSet[str]] = attr.ib(
+        default=None, converter=_natures
+    )
+    ivs: Tuple[Tuple[str, int, int], ...] = attr.ib(
+        factory=dict, converter=_iv_ranges
+    )
+    ability: Optional[int] = None
+    shiny: bool = False
+    trainer_id: int = 0
+    secret_id: int = 0
+
+    def mask(self, pid: 'np.ndarray', gene: 'np.ndarray') -> 'np.ndarray':
+        """Evaluate the criteria on arrays of PIDs and genes.
+
+        :return: A boolean array, True where the criteria are met.
+        """
+        mask = np.ones(len(pid), dtype=bool)
+        if self.natures is not None:
+            indices = [GAME_INDICES[nature] for nature in self.natures]
+            mask &= np.isin(pid % 25, indices)
+        if self.ability is not None:
+            mask &= (pid & 1) == self.ability
+        if self.shiny:
+            mask &= (
+                (pid >> 16) ^ (pid & 0xFFFF) ^ self.trainer_id ^ self.secret_id
+            ) < 8
+        for stat, low, high in self.ivs:
+            iv = (gene >> IV_SHIFTS[stat]) & 31
+            mask &= (low <= iv) & (iv <= high)
+        return mask
+
+    def matches(self, pid: int, gene: int) -> bool:
+        """Check a single PID and gene."""
+        return bool(
+            self.mask(
+                np.array([pid], dtype=np.uint64), np.array([gene], np.uint64)
+            )[0]
+        )
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class Match:
+    """A genome meeting the criteria, and where to find it."""
+
+    seed: int
+    frame: int
+    method: int
+    pid: int
+    gene: int
+
+    @property
+    def nature(self) -> str:
+        return NATURES[self.pid % 25]
+
+    @property
+    def iv(self) -> Stats:
+        return Stats.make_iv(self.gene)
+
+
+def _genomes(
+    outputs: Sequence['np.ndarray'], method: int
+) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Build the PIDs and genes from the random numbers drawn after each
+    seed: ``outputs[i]`` holds the (i + 1)-th ones."""
+    pid = outputs[0] | (outputs[1] << 16)
+    first, second = IV_CALLS[method]
+    gene = outputs[first - 1] | (outputs[second - 1] << 16)
+    return pid, gene
+
+
+def _scan_frames(
+    seed: int, start: int, stop: int, method: int, criteria: Criteria
+) -> List[Match]:
+    """Search frames ``start`` to ``stop`` of one seed, all at once."""
+    prng = PRNG(seed)
+    prng.advance(start)
+    count = stop - start
+    calls = IV_CALLS[method][1]
+    stream = prng.next_array(count + calls - 1).astype(np.uint64)
+    outputs = [stream[i : i + count] for i in range(calls)]
+    pid, gene = _genomes(outputs, method)
+    return [
+        Match(seed, start + int(i), method, int(pid[i]), int(gene[i]))
+        for i in np.flatnonzero(criteria.mask(pid, gene))
+    ]
+
+
+def _scan_seeds(
+    seeds: Sequence[int], start: int, stop: int, method: int, criteria: Criteria
+) -> List[Match]:
+    """Search frames ``start`` to ``stop`` of many seeds, one frame at a
+    time for all the seeds at once."""
+    if isinstance(seeds, range):
+        seeds = np.arange(seeds.start, seeds.stop, seeds.step, dtype=np.uint64)
+    else:
+        seeds = np.asarray(seeds, dtype=np.uint64)
+    mult, add = _affine_power(MULTIPLIER, INCREMENT, start)
+    states = (seeds * np.uint64(mult) + np.uint64(add)) & np.uint64(0xFFFFFFFF)
+    mult, add = np.uint64(MULTIPLIER), np.uint64(INCREMENT)
+    calls = IV_CALLS[method][1]
+    matches = []
+    for frame in range(start, stop):
+        outputs = []
+        state = states
+        for _ in range(calls):
+            state = (state * mult + add) & np.uint64(0xFFFFFFFF)
+            outputs.append(state >> np.uint64(16))
+        # The next frame starts one step later.
+        states = (states * mult + add) & np.uint64(0xFFFFFFFF)
+        pid, gene = _genomes(outputs, method)
+        matches.extend(
+            Match(int(seeds[i]), frame, method, int(pid[i]), int(gene[i]))
+            for i in np.flatnonzero(criteria.mask(pid, gene))
+        )
+    return matches
+
+
+def _tasks(
+    seeds: Sequence[int], frames: range, method: int, criteria: Criteria
+) -> Iterator[tuple]:
+    """Split a search into chunks of about ``CHUNK_SIZE`` evaluations."""
+    if len(seeds) == 1:
+        for start in range(frames.start, frames.stop, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, frames.stop)
+            yield _scan_frames, seeds[0], start, stop, method, criteria
+    else:
+        size = max(1, CHUNK_SIZE // max(1, len(frames)))
+        for i in range(0, len(seeds), size):
+            yield (
+                _scan_seeds,
+                seeds[i : i + size],
+                frames.start,
+                frames.stop,
+                method,
+                criteria,
+            )
+
+
+def search(
+    criteria: Criteria,
+    seeds: Sequence[int],
+    frames: range = range(1),
+    method: int = 2,
+    processes: Optional[int] = None,
+) -> Iterator[Match]:
+    """Find the seeds and frames that generate Pokémon meeting
+    ``criteria``.
+
+    Matches are yielded as soon as the chunk they are in is searched, so
+    they come in order within a chunk only.
+
+    :param criteria: The ``Criteria`` to meet.
+    :param seeds: The seeds to search, e.g. ``range(0x10000)``.
+    :param frames: The frames to search for each seed. Its step is
+        ignored.
+    :param method: The Pokémon generation method: 1, 2, or 4.
+    :param processes: The number of worker processes. Defaults to the
+        number of CPUs. With 1, the search runs in this process.
+    :return: An iterator of ``Match``.
+    """
+    if np is None:
+        raise ImportError('Searching requires NumPy: pip install numpy')
+    if method not in IV_CALLS:
+        raise ValueError(f'Only methods 1, 2, 4 are supported, got {method}.')
+    tasks = _tasks(seeds, frames, method, criteria)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for func, *args in tasks:
+            yield from func(*args)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        # Keep every worker busy without queueing the whole search.
+        pending = {
+            executor.submit(*task)
+            for task in itertools.islice(tasks, 2 * processes)
+        }
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield from future.result()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.add(executor.submit(*task))
+
+
+def recover_seeds(
+    iv: Union[Stats, Mapping[str, int]],
+    method: int = 2,
+    criteria: Criteria = None,
+) -> List[Match]:
+    """Find every seed that generates a Pokémon with the given IVs.
+
+    Each half of the gene fixes 15 of the upper 16 bits of one LCG
+    state. The 2 * 2**16 states agreeing with the first half are
+    stepped to the second half's state and checked against it, and the
+    survivors are rewound to the seed that starts the genome.
+
+    :param iv: The six IVs, as a ``Stats`` or a mapping of stat names.
+    :param method: The Pokémon generation method: 1, 2, or 4.
+    :param criteria: Further criteria the genomes must meet, e.g. the
+        nature.
+    :return: The matches, at frame 0 of their seeds, sorted by seed.
+    """
+    if np is None:
+        raise ImportError('Searching requires NumPy: pip install numpy')
+    if method not in IV_CALLS:
+        raise ValueError(f'Only methods 1, 2, 4 are supported, got {method}.')
+    if not isinstance(iv, Mapping):
+        iv = {stat: getattr(iv, stat) for stat in IV_SHIFTS}
+    gene = 0
+    for stat, shift in IV_SHIFTS.items():
+        gene |= iv[stat] << shift
+    first_half, second_half = gene & 0x7FFF, gene >> 16
+
+    first, second = IV_CALLS[method]
+    low = np.arange(1 << 16, dtype=np.uint64)
+    states = np.concatenate(
+        [((first_half | bit << 15) << 16) | low for bit in (0, 1)]
+    )
+    mult, add = _affine_power(MULTIPLIER, INCREMENT, second - first)
+    later = (states * np.uint64(mult) + np.uint64(add)) & np.uint64(0xFFFFFFFF)
+    states = states[(later >> np.uint64(16)) & np.uint64(0x7FFF) == second_half]
+
+    mult, add = _affine_power(INVERSE_MULTIPLIER, INVERSE_INCREMENT, first)
+    matches = []
+    for state in states.tolist():
+        seed = (mult * state + add) & 0xFFFFFFFF
+        pid, gene = PRNG(seed).create_genome(method)
+        if criteria is None or criteria.matches(pid, gene):
+            matches.append(Match(seed, 0, method, pid, gene))
+    return sorted(matches, key=lambda match: match.seed)
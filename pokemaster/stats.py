@@ -1,13 +1,27 @@
 """Provides general ``Stats`` class for statistics-related functionality
 and ``Conditions`` class for contests."""
 import operator
+from collections import namedtuple
 from numbers import Real
-from typing import Callable, ClassVar, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
 
 import attr
-from attr.validators import instance_of
 
-from pokemaster import _database
+from pokemaster import _database, natures
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional.
+    np = None
 
 
 @attr.s(slots=True, auto_attribs=True)
@@ -21,11 +35,21 @@ class Conditions:
     toughness: int = 0
 
 
-@attr.s(auto_attribs=True, slots=True, frozen=True)
-class Stats:
+_NAMES = (
+    'hp',
+    'attack',
+    'defense',
+    'special_attack',
+    'special_defense',
+    'speed',
+)
+
+
+class Stats(namedtuple('Stats', _NAMES)):
     """A generic statistics representation.
 
-    ``Stats`` instances are "immutable".
+    ``Stats`` instances are immutable tuples of six numbers, in the
+    order of ``_NAMES``.
 
     For IV, species strengths (a.k.a. base stats), and EV yields,
     having ``Stats`` immutable makes perfect sense, since they are
@@ -34,6 +58,16 @@ class Stats:
     adding/subtracting/multiplying/dividing another ``Stats`` instance,
     being mutable does not do much good for ``Stats``.
 
+    The constructor checks that every stat is a real number. Internal
+    code that already has valid numbers builds instances with
+    ``Stats._make()``, which skips the check.
+
+    ``Stats`` is not an attrs class: use ``_asdict()``, ``_replace()``
+    and ``_fields`` instead of ``attr.asdict()``, ``attr.evolve()`` and
+    ``attr.fields()``. It compares equal to a tuple of the same six
+    numbers. Adding it to a plain tuple is a ``TypeError``, not a
+    concatenation.
+
     Usage::
 
         >>> ev = Stats()
@@ -42,68 +76,125 @@ class Stats:
         >>> species_strengths = Stats.make_species_strengths('eevee')
     """
 
-    _NAMES: ClassVar[Tuple[str, ...]] = (
-        'hp',
-        'attack',
-        'defense',
-        'special_attack',
-        'special_defense',
-        'speed',
-    )
+    __slots__ = ()
+
+    _NAMES: ClassVar[Tuple[str, ...]] = _NAMES
+
+    def __new__(
+        cls,
+        hp: Real = 0,
+        attack: Real = 0,
+        defense: Real = 0,
+        special_attack: Real = 0,
+        special_defense: Real = 0,
+        speed: Real = 0,
+    ):
+        values = (hp, attack, defense, special_attack, special_defense, speed)
+        for name, value in zip(_NAMES, values):
+            if not isinstance(value, Real):
+                raise TypeError(
+                    f"'{name}' must be a real number, got {value!r}."
+                )
+        return tuple.__new__(cls, values)
 
-    hp: Real = attr.ib(validator=instance_of(Real), default=0)
-    attack: Real = attr.ib(validator=instance_of(Real), default=0)
-    defense: Real = attr.ib(validator=instance_of(Real), default=0)
-    special_attack: Real = attr.ib(validator=instance_of(Real), default=0)
-    special_defense: Real = attr.ib(validator=instance_of(Real), default=0)
-    speed: Real = attr.ib(validator=instance_of(Real), default=0)
+    def _operate(
+        self,
+        operator: Callable[[Real, Real], Real],
+        other: Union['Stats', Real],
+    ) -> 'Stats':
+        """Apply ``operator`` point-wisely if ``other`` is a ``Stats``
+        instance, or with the scalar ``other`` otherwise."""
+        if isinstance(other, Stats):
+            return tuple.__new__(type(self), map(operator, self, other))
+        if isinstance(other, Real):
+            return tuple.__new__(
+                type(self), [operator(value, other) for value in self]
+            )
+        # Let ``StatsArray`` handle ``Stats`` on its left; any other
+        # operand is a TypeError.
+        return NotImplemented
 
     def __add__(self, other):
-        return self._make_operator(operator.add, other)
+        return self._operate(operator.add, other)
 
     def __sub__(self, other):
-        return self._make_operator(operator.sub, other)
+        return self._operate(operator.sub, other)
 
     def __mul__(self, other):
-        return self._make_operator(operator.mul, other)
+        return self._operate(operator.mul, other)
 
     def __floordiv__(self, other):
-        return self._make_operator(operator.floordiv, other)
+        return self._operate(operator.floordiv, other)
+
+    def __radd__(self, other):
+        if isinstance(other, tuple):
+            # Python tries this before concatenating ``other + self``.
+            raise TypeError(
+                f"unsupported operand type(s) for +: "
+                f"'{type(other).__name__}' and '{type(self).__name__}'"
+            )
+        return self._operate(operator.add, other)
 
-    __radd__ = __add__
     __rmul__ = __mul__
 
+    @classmethod
+    def make_permanent_stats(
+        cls,
+        species_strengths: 'Stats',
+        iv: 'Stats',
+        ev: 'Stats',
+        level: int,
+        nature_modifiers: 'Stats',
+    ) -> 'Stats':
+        """Calculate a Pokémon's stats in one pass, without the
+        intermediate ``Stats`` of the operators.
+
+        The formula is ((2 * base + IV + EV // 4) * level // 100 + 5)
+        * nature, with 10 + level instead of 5 for the HP. A species
+        with a base HP of 1 (Shedinja) always has 1 HP.
+
+        :return: A ``Stats`` instance.
+        """
+        stats = [
+            ((2 * base + i + e // 4) * level // 100 + 5) * modifier
+            for base, i, e, modifier in zip(
+                species_strengths, iv, ev, nature_modifiers
+            )
+        ]
+        base_hp = species_strengths[0]
+        if base_hp == 1:
+            stats[0] = 1
+        else:
+            stats[0] = (
+                (2 * base_hp + iv[0] + ev[0] // 4) * level // 100 + 10 + level
+            ) * nature_modifiers[0]
+        return tuple.__new__(cls, stats)
+
     @classmethod
     def make_nature_modifiers(cls, nature: str) -> 'Stats':
-        """Create a NatureModifiers instance from the Nature table.
+        """Create the stat modifiers of a nature, from the constant
+        table of ``pokemaster.natures``.
 
         :param nature: The identifier of a nature.
         :return: A ``Stats`` instance.
         """
-        nature_row = _database.get_nature(identifier=nature)
-        modifiers = {}
-        for stat in cls._NAMES:
-            modifiers[stat] = 1
-        if nature_row.is_neutral:
-            return cls(**modifiers)
-        increased_stat = nature_row.increased_stat.identifier.replace('-', '_')
-        decreased_stat = nature_row.decreased_stat.identifier.replace('-', '_')
-        modifiers[increased_stat] = 1.1
-        modifiers[decreased_stat] = 0.9
-        return cls(**modifiers)
+        game_index = natures.get_nature(identifier=nature).game_index
+        return cls._make(natures.MODIFIERS[game_index])
 
     @classmethod
-    def make_species_strengths(cls, species: str) -> 'Stats':
+    def make_species_strengths(
+        cls, species: str = None, national_id: int = None
+    ) -> 'Stats':
         """Create a Pokémon's species strengths stats.
 
         :param species: The identifier of a Pokémon species.
+        :param national_id: The National Pokédex ID, instead of the
+            species.
         :return: A ``Stats`` instance.
         """
-        pokemon = _database.get_pokemon(species=species)
-        strengths = {}
-        for i, stat in enumerate(cls._NAMES):
-            strengths[stat] = pokemon.stats[i].base_stat
-        return cls(**strengths)
+        species_stats = _database.get_species_stats()
+        row = species_stats.row(national_id, species)
+        return cls._make(species_stats.base_stats[row])
 
     @classmethod
     def make_iv(cls, gene: int) -> 'Stats':
@@ -112,64 +203,243 @@ class Stats:
         :param gene: An ``int`` generated by the PRNG.
         :return: A ``Stats`` instance.
         """
-        return cls(
-            hp=gene % 32,
-            attack=(gene >> 5) % 32,
-            defense=(gene >> 10) % 32,
-            speed=(gene >> 16) % 32,
-            special_attack=(gene >> 21) % 32,
-            special_defense=(gene >> 26) % 32,
+        return cls._make(
+            (
+                gene % 32,
+                (gene >> 5) % 32,
+                (gene >> 10) % 32,
+                (gene >> 21) % 32,
+                (gene >> 26) % 32,
+                (gene >> 16) % 32,
+            )
         )
 
     @classmethod
-    def make_ev_yield(cls, species: str) -> 'Stats':
+    def make_ev_yield(
+        cls, species: str = None, national_id: int = None
+    ) -> 'Stats':
         """Create an EV instance from PokemonStats table.
 
         :param species: The identifier of a Pokémon species.
+        :param national_id: The National Pokédex ID, instead of the
+            species.
         :return: A ``Stats`` instance.
         """
-        pokemon = _database.get_pokemon(species=species)
-        stats = pokemon.stats
-        yields = {stat: stats[i].effort for i, stat in enumerate(cls._NAMES)}
-        return cls(**yields)
+        species_stats = _database.get_species_stats()
+        row = species_stats.row(national_id, species)
+        return cls._make(species_stats.effort[row])
 
     def validate_iv(self) -> bool:
         """Check if each IV is between 0 and 32."""
-        for stat in self._NAMES:
-            if not 0 <= getattr(self, stat) <= 32:
+        for stat, value in zip(self._NAMES, self):
+            if not 0 <= value <= 32:
                 raise ValueError(
-                    f"The {stat} IV ({getattr(self, stat)}) must be a number "
+                    f"The {stat} IV ({value}) must be a number "
                     "between 0 and 32 inclusive."
                 )
         return True
 
-    def _make_operator(
-        self,
-        operator: Callable[[Real, Real], Real],
-        other: Union['Stats', Real],
-    ) -> 'Stats':
-        """Programmatically create point-wise operators.
 
-        :param operator: A callable (Real, Real) -> Real.
-        :param other: If ``other`` is a ``Stats`` instance, then the
-            operator will be applied point-wisely. If ``other`` is a
-            number, then a scalar operation will be applied.
-        :return: A ``Stats`` instance.
+def _column(index: int) -> property:
+    return property(
+        lambda self: self._array[:, index],
+        doc=f'The {_NAMES[index]} column, as a view.',
+    )
+
+
+class StatsArray:
+    """The stats of many Pokémon, as an N×6 NumPy array.
+
+    Columns are in the order of ``Stats._NAMES``. ``StatsArray``
+    supports the operators of ``Stats``, with a ``StatsArray``, a
+    ``Stats`` (applied to every row), or a number. Requires NumPy.
+
+    Wrapping an array, ``np.asarray()``, slicing, and the stat columns
+    share memory with the array. Indexing a single row, or iterating,
+    gives ``Stats``.
+
+    Usage::
+
+        >>> ivs = StatsArray.make_iv(prng.next_seeds(10**6))
+        >>> ivs.attack.mean()
+        >>> ivs[0]
+        Stats(hp=..., attack=..., ...)
+    """
+
+    __slots__ = ('_array',)
+
+    def __init__(self, array: Union['np.ndarray', Iterable[Iterable[Real]]]):
+        """Wrap an N×6 array, without copying it if it is an ndarray.
+
+        :param array: An N×6 array-like. A single row of 6 is taken as
+            a 1×6 array.
+        """
+        if np is None:
+            raise ImportError('`StatsArray` requires NumPy: pip install numpy')
+        array = np.asarray(array)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.ndim != 2 or array.shape[1] != len(_NAMES):
+            raise ValueError(
+                f'A `StatsArray` must be N×{len(_NAMES)}, got {array.shape}.'
+            )
+        self._array = array
+
+    @classmethod
+    def from_stats(cls, stats: Iterable[Stats]) -> 'StatsArray':
+        """Stack ``Stats`` instances into an array."""
+        return cls(np.array(list(stats)).reshape(-1, len(_NAMES)))
+
+    @classmethod
+    def make_iv(cls, genes: 'np.ndarray') -> 'StatsArray':
+        """Create IV stats from an array of genes. See
+        ``Stats.make_iv()``."""
+        genes = np.asarray(genes, dtype=np.int64)
+        shifts = np.array([0, 5, 10, 21, 26, 16], dtype=np.int64)
+        return cls((genes[:, np.newaxis] >> shifts) % 32)
+
+    @classmethod
+    def make_species_strengths(cls, national_ids: 'np.ndarray') -> 'StatsArray':
+        """Look up the species strengths of an array of National
+        Pokédex IDs. See ``Stats.make_species_strengths()``."""
+        species_stats = _database.get_species_stats()
+        return cls(
+            species_stats.array('base_stats')[species_stats.rows(national_ids)]
+        )
+
+    @classmethod
+    def make_ev_yield(cls, national_ids: 'np.ndarray') -> 'StatsArray':
+        """Look up the EV yields of an array of National Pokédex IDs.
+        See ``Stats.make_ev_yield()``."""
+        species_stats = _database.get_species_stats()
+        return cls(
+            species_stats.array('effort')[species_stats.rows(national_ids)]
+        )
+
+    @classmethod
+    def make_permanent_stats(
+        cls,
+        species_strengths: Union[Stats, 'StatsArray'],
+        iv: Union[Stats, 'StatsArray'],
+        ev: Union[Stats, 'StatsArray'],
+        level: Union[int, 'np.ndarray'],
+        nature_modifiers: Union[Stats, 'StatsArray'],
+    ) -> 'StatsArray':
+        """Calculate the stats of many Pokémon at once. See
+        ``Stats.make_permanent_stats()``.
+
+        Each argument is either one value for every Pokémon or one per
+        Pokémon, e.g. one species at every level::
+
+            >>> StatsArray.make_permanent_stats(
+            ...     base, iv, Stats(), np.arange(1, 101), modifiers
+            ... )
+
+        :return: A ``StatsArray``, of floats if any nature modifier is a
+            float, as with ``Stats``.
         """
-        if not isinstance(other, type(self)) and not isinstance(other, Real):
+        base = _as_array(species_strengths)
+        level = np.asarray(level).reshape(-1, 1)
+        stats = (2 * base + _as_array(iv) + _as_array(ev) // 4) * level // 100
+        stats = np.atleast_2d(stats + 5)
+        stats[:, 0] += 5 + level[:, 0]
+        stats = stats * _as_array(nature_modifiers)
+        # A base HP of 1 (Shedinja) always gives 1 HP.
+        stats[:, 0] = np.where(base[..., 0] == 1, 1, stats[:, 0])
+        return cls(stats)
+
+    @property
+    def array(self) -> 'np.ndarray':
+        """The underlying N×6 array."""
+        return self._array
+
+    hp = _column(0)
+    attack = _column(1)
+    defense = _column(2)
+    special_attack = _column(3)
+    special_defense = _column(4)
+    speed = _column(5)
+
+    def __array__(self, dtype=None, copy=None) -> 'np.ndarray':
+        if dtype is None or dtype == self._array.dtype:
+            return self._array
+        return self._array.astype(dtype)
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, key) -> Union[Stats, 'StatsArray']:
+        if isinstance(key, (int, np.integer)):
+            return Stats._make(self._array[key].tolist())
+        return StatsArray(self._array[key])
+
+    def __iter__(self) -> Iterator[Stats]:
+        return map(Stats._make, self._array.tolist())
+
+    def to_stats(self) -> List[Stats]:
+        """Convert each row to ``Stats``."""
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StatsArray):
+            return NotImplemented
+        return np.array_equal(self._array, other._array)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'StatsArray({self._array!r})'
+
+    def _operate(
+        self,
+        operator: Callable[['np.ndarray', 'np.ndarray'], 'np.ndarray'],
+        other: Union['StatsArray', Stats, Real],
+    ) -> 'StatsArray':
+        if not isinstance(other, (StatsArray, Stats, Real)):
             raise TypeError(
                 f"unsupported operand type(s) for {operator}: "
                 f"'{type(self)}' and '{type(other)}'"
             )
-        result_stats = {}
-        for stat in self._NAMES:
-            if isinstance(other, type(self)):
-                result_stats[stat] = operator(
-                    getattr(self, stat), getattr(other, stat)
-                )
-            elif isinstance(other, Real):
-                result_stats[stat] = operator(getattr(self, stat), other)
-        return self.__class__(**result_stats)
+        return StatsArray(operator(self._array, _as_array(other)))
+
+    def __add__(self, other):
+        return self._operate(operator.add, other)
+
+    def __sub__(self, other):
+        return self._operate(operator.sub, other)
+
+    def __mul__(self, other):
+        return self._operate(operator.mul, other)
+
+    def __floordiv__(self, other):
+        return self._operate(operator.floordiv, other)
+
+    def __rsub__(self, other):
+        return self._operate(_reflected(operator.sub), other)
+
+    def __rfloordiv__(self, other):
+        return self._operate(_reflected(operator.floordiv), other)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+
+def _reflected(
+    operator: Callable[[Any, Any], Any]
+) -> Callable[[Any, Any], Any]:
+    """Swap the operands of ``operator``."""
+    return lambda left, right: operator(right, left)
+
+
+def _as_array(
+    stats: Union[Stats, StatsArray, Real]
+) -> Union['np.ndarray', Real]:
+    """The array, or the row of 6, of stats; numbers as is."""
+    if isinstance(stats, StatsArray):
+        return stats._array
+    if isinstance(stats, Stats):
+        return np.array(stats)
+    return stats
 
 
 @attr.s(auto_attribs=True, slots=True)
@@ -188,7 +458,4 @@ class BattleStats:
     @classmethod
     def from_stats(cls, stats: Stats) -> "BattleStats":
         """Create a ``BattleStats`` instance from a Pokémon's stats."""
-        attribs = attr.asdict(stats)
-        attribs['evasion'] = 1.0
-        attribs['accuracy'] = 1.0
-        return cls(**attribs)
+        return cls(*stats, evasion=1.0, accuracy=1.0)
@@ -0,0 +1,135 @@
+"""Tests for `pokemaster.aio`."""
+import asyncio
+import threading
+
+import pytest
+import sqlalchemy
+
+from pokemaster import _database, aio
+from pokemaster.pokemon import Pokemon
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def two_workers():
+    aio.configure(max_workers=2)
+    yield
+    aio.configure()
+
+
+def test_create_pokemon():
+    eevee = run(aio.create_pokemon(species='eevee', level=20))
+    assert isinstance(eevee, Pokemon)
+    assert 20 == eevee.level
+
+
+def test_async_helpers_match_sync_helpers():
+    async def answers():
+        return (
+            (await aio.get_pokemon(species='eevee')).identifier,
+            (await aio.get_machine(108)).move_id,
+            await aio.can_learn_move('toxic', species='eevee'),
+        )
+
+    assert run(answers()) == (
+        _database.get_pokemon(species='eevee').identifier,
+        _database.get_machine(108).move_id,
+        _database.can_learn_move('toxic', species='eevee'),
+    )
+
+
+def test_returned_rows_have_their_relationships_loaded():
+    """Reading the relationships of the returned rows makes no query in
+    the worker thread's session."""
+
+    async def answers():
+        return (
+            await aio.get_pokemon(species='eevee'),
+            await aio.get_pokemon_many(species=['eevee', 'mew']),
+        )
+
+    eevee, many = run(answers())
+    for pokemon in [eevee, *many]:
+        assert not sqlalchemy.inspect(pokemon).unloaded & {
+            'species',
+            'types',
+            'stats',
+        }
+
+
+def test_bounded_concurrency(two_workers):
+    """Many pending requests share the bounded thread pool."""
+    threads = set()
+
+    def get_experience(level):
+        threads.add(threading.current_thread().name)
+        return _database.get_experience(species='eevee', level=level)
+
+    async def many():
+        return await asyncio.gather(
+            *(aio.run(get_experience, level) for level in range(1, 101))
+        )
+
+    levels = [experience.level for experience in run(many())]
+    assert list(range(1, 101)) == levels
+    assert 1 <= len(threads) <= 2
+    assert threading.current_thread().name not in threads
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """Record the calls sent to the thread pool."""
+    calls = []
+    pool_run = aio.run
+
+    async def run_(func, *args, **kwargs):
+        calls.append(func)
+        return await pool_run(func, *args, **kwargs)
+
+    monkeypatch.setattr(aio, 'run', run_)
+    return calls
+
+
+def test_snapshot_helpers_run_on_event_loop_thread(pooled):
+    async def answers():
+        return (
+            (await aio.get_pokemon(species='eevee')).identifier,
+            await aio.can_learn_move('toxic', species='eevee'),
+            (await aio.create_pokemon('eevee', level=5)).level,
+        )
+
+    _database.load_snapshot()
+    try:
+        assert ('eevee', True, 5) == run(answers())
+    finally:
+        _database.drop_snapshot()
+    assert [] == pooled
+
+
+def test_snapshot_misses_run_on_pool(pooled):
+    """Helpers the snapshot cannot serve, and arbitrary functions, still
+    run on the thread pool."""
+
+    async def answers():
+        await aio.get_learnset(species='eevee', version_group='firered')
+        return await aio.run(lambda: threading.current_thread())
+
+    _database.load_snapshot()
+    try:
+        thread = run(answers())
+    finally:
+        _database.drop_snapshot()
+    assert threading.current_thread() is not thread
+    assert _database.get_learnset is pooled[0].__wrapped__
+
+
+def test_configure_rejects_no_workers():
+    with pytest.raises(ValueError):
+        aio.configure(max_workers=0)
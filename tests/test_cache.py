@@ -0,0 +1,28 @@
+"""Tests for ``pokemaster._cache``."""
+import pytest
+
+from pokemaster._cache import CacheInfo, LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert 1 == cache.get('a')
+    cache.put('c', 3)
+    assert 'b' not in cache._data
+    assert CacheInfo(1, 0, 1, 2, 2) == cache.info()
+
+
+def test_lru_cache_miss():
+    cache = LRUCache()
+    with pytest.raises(KeyError):
+        cache.get('a')
+    assert cache.get('a', None) is None
+    assert 2 == cache.misses
+
+
+def test_lru_cache_of_size_0_caches_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put('a', 1)
+    assert 0 == len(cache)
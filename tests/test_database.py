@@ -1,4 +1,10 @@
 """Tests for `pokemaster.database`."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import sqlalchemy
+from sqlalchemy.orm.exc import NoResultFound
 
 from pokemaster import _database
 
@@ -51,3 +57,367 @@ def test_get_specific_pokemon_form():
     exact Pokémon form for those who have multiple forms."""
     castform_rainy = _database.get_pokemon(species='castform', form='rainy')
     assert 'castform-rainy' == castform_rainy.identifier
+
+
+@pytest.fixture
+def snapshot():
+    """Load the snapshot for the duration of a test."""
+    yield _database.load_snapshot()
+    _database.drop_snapshot()
+
+
+def move_lookups():
+    """Look up moves of every generation, by identifier and by ID."""
+    found = []
+    for lookup in [
+        {'move': 'focus-punch'},
+        {'move_id': 291},
+        {'move': 'dive', 'move_id': 291},
+        {'move': 'tackle'},
+        {'move_id': 226},
+        {'move': 'dive', 'move_id': 264},
+        {'move': 'shadow-claw'},
+    ]:
+        try:
+            move = _database.get_move(**lookup)
+        except NoResultFound:
+            found.append(None)
+        else:
+            found.append((move.id, move.identifier, move.pp))
+    return found
+
+
+def test_snapshot_get_move(snapshot):
+    """The snapshot finds the same moves as the database."""
+    from_snapshot = move_lookups()
+    _database.drop_snapshot()
+    assert move_lookups() == from_snapshot
+    assert (33, 'tackle', 35) == from_snapshot[3]
+    assert (226, 'baton-pass', 40) == from_snapshot[4]
+    assert [None, None] == from_snapshot[5:]
+
+
+def test_snapshot_get_pokemon(snapshot):
+    """The snapshot resolves the same Pokémon as the database."""
+    assert 'bulbasaur' == _database.get_pokemon(national_id=1).identifier
+    assert 'deoxys-normal' == _database.get_pokemon(national_id=386).identifier
+    castform_rainy = _database.get_pokemon(species='castform', form='rainy')
+    assert 'castform-rainy' == castform_rainy.identifier
+
+
+def test_snapshot_queries_match_database(snapshot):
+    """Every helper gives the same answers with or without the
+    snapshot."""
+
+    def answers():
+        return (
+            _database.get_experience(species='eevee', exp=2000).level,
+            _database.get_experience(species='eevee', level=13).experience,
+            _database.get_nature(personality=0x7E482751).identifier,
+            _database.get_ability(species='nidorina', personality=1).identifier,
+            _database.get_pokemon_gender(
+                species='nidorina', personality=0
+            ).identifier,
+            [
+                move.identifier
+                for move in _database.get_pokemon_default_moves(
+                    level=42, species='eevee'
+                )
+            ],
+            _database.get_machine(108).move_id,
+            _database.get_machine(move_identifier='toxic').machine_number,
+        )
+
+    from_snapshot = answers()
+    _database.drop_snapshot()
+    assert answers() == from_snapshot
+
+
+def test_set_session_drops_snapshot(snapshot):
+    """Binding another database invalidates the snapshot."""
+    session = _database.SESSION
+    _database.set_session(_database.get_session())
+    assert _database._SNAPSHOT is None
+    _database.set_session(session)
+
+
+def test_experience_curve():
+    """Experience curves map levels to experience points both ways."""
+    curve = _database.get_experience_curve(species='eevee')
+    assert 12 == curve.level(2000)
+    assert 2197 == curve.experience_at(13)
+    assert 100 == curve.level(curve.experience_at(100))
+    assert 100 == curve.max_level
+
+
+def test_get_experience_by_exp():
+    """The highest level reached with the given exp. is returned."""
+    experience = _database.get_experience(species='eevee', exp=2000)
+    assert 12 == experience.level
+    assert 1728 == experience.experience
+    with pytest.raises(ValueError):
+        _database.get_experience(species='eevee', level=13, exp=2000)
+
+
+def test_query_cache_hits():
+    """Repeated lookups are answered from the query cache."""
+    _database.clear_cache(reset_stats=True)
+    first = _database.get_pokemon(species='eevee')
+    assert first is _database.get_pokemon(species='eevee')
+    info = _database.cache_info()['get_pokemon']
+    assert 1 == info.hits
+    assert 1 == info.misses
+
+
+def test_query_cache_eviction():
+    """The least recently used results are evicted from a full
+    cache."""
+    _database.clear_cache(reset_stats=True)
+    _database.configure_cache(maxsize=1)
+    try:
+        _database.get_machine(1)
+        _database.get_machine(6)
+        _database.get_machine(1)
+        info = _database.cache_info()['get_machine']
+        assert 0 == info.hits
+        assert 2 == info.evictions
+        assert 1 == info.currsize
+    finally:
+        _database.configure_cache()
+
+
+def test_set_session_clears_query_cache():
+    """Binding another database invalidates the cached results."""
+    _database.get_pokemon(species='eevee')
+    _database.set_session(_database.get_session())
+    assert 0 == _database.cache_info()['get_pokemon'].currsize
+
+
+def test_session_scope():
+    """A session can be bound to the current thread for a block of
+    work."""
+    with _database.session_scope() as session:
+        assert _database._session() is session
+        assert 'eevee' == _database.get_pokemon(species='eevee').identifier
+    assert _database._session() is not session
+
+
+def test_threads_get_their_own_sessions():
+    """Each thread queries with its own session."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        barrier = threading.Barrier(2)
+
+        def thread_session(_):
+            barrier.wait()
+            return _database._session()
+
+        sessions = set(executor.map(thread_session, range(2)))
+    assert 2 == len(sessions)
+
+
+def test_get_pokemon_many():
+    """Bulk lookups return the Pokémon in input order, in a fixed number
+    of queries."""
+    engine = _database._session().bind
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    sqlalchemy.event.listen(engine, 'before_cursor_execute', count)
+    try:
+        pokemon = _database.get_pokemon_many(national_ids=[386, 1, 1])
+        few = len(statements)
+        _database.get_pokemon_many(species=['eevee', 'mew', 'bulbasaur'])
+        assert few == len(statements) - few
+    finally:
+        sqlalchemy.event.remove(engine, 'before_cursor_execute', count)
+    assert ['deoxys-normal', 'bulbasaur', 'bulbasaur'] == [
+        p.identifier for p in pokemon
+    ]
+
+
+def test_get_experience_many():
+    experience = _database.get_experience_many(
+        species=['eevee', 'bulbasaur'], levels=[13, None], exps=[None, 0]
+    )
+    assert [(13, 2197), (1, 0)] == [
+        (row.level, row.experience) for row in experience
+    ]
+
+
+def species_table():
+    species_stats = _database.get_species_stats()
+    return [
+        (
+            national_id,
+            species_stats.base_stats[species_stats.row(species=identifier)],
+            species_stats.effort[species_stats.row(national_id)],
+        )
+        for national_id, identifier in zip(
+            species_stats.national_ids, species_stats.identifiers
+        )
+    ]
+
+
+def test_get_species_stats():
+    """The tables agree with the stats of each species' Pokémon, and
+    are built once."""
+    for national_id, base_stats, effort in species_table():
+        stats = _database.get_pokemon(national_id=national_id).stats
+        assert tuple(stat.base_stat for stat in stats) == base_stats
+        assert tuple(stat.effort for stat in stats) == effort
+    assert _database.get_species_stats() is _database.get_species_stats()
+    with pytest.raises(NoResultFound):
+        _database.get_species_stats().row(species='missingno')
+    with pytest.raises(NoResultFound):
+        _database.get_species_stats().row(national_id=1, species='eevee')
+
+
+def test_species_stats_shared_between_sessions():
+    """The tables are built once per database, not per session."""
+    species_stats = _database.get_species_stats()
+    with _database.session_scope():
+        assert _database.get_species_stats() is species_stats
+    with ThreadPoolExecutor(2) as executor:
+        assert {species_stats} == set(
+            executor.map(lambda _: _database.get_species_stats(), range(4))
+        )
+    _database.set_session(_database.get_session())
+    assert _database.get_species_stats() is not species_stats
+
+
+def test_snapshot_species_stats(snapshot):
+    from_snapshot = species_table()
+    _database.drop_snapshot()
+    assert species_table() == from_snapshot
+
+
+def test_get_nature_many():
+    personalities = [0x7E482751, 0, 24, 0x7E482751]
+    assert [
+        _database.get_nature(personality).identifier
+        for personality in personalities
+    ] == [
+        nature.identifier for nature in _database.get_nature_many(personalities)
+    ]
+
+
+def test_get_learnset():
+    """Learnsets give the latest level-up moves and check if a move is
+    learnable."""
+    learnset = _database.get_learnset(species='eevee')
+    assert ['quick-attack', 'bite', 'baton-pass', 'take-down'] == [
+        move.identifier for move in learnset.latest_moves(42)
+    ]
+    assert 'bite' in learnset
+    assert 'toxic' not in learnset
+    assert () == learnset.latest_moves(0)
+
+
+def test_can_learn_move():
+    assert _database.can_learn_move('toxic', species='eevee')
+    assert _database.can_learn_move(
+        'toxic', species='eevee', move_method='machine'
+    )
+    assert not _database.can_learn_move(
+        'toxic', species='eevee', move_method='level-up'
+    )
+    assert not _database.can_learn_move('surf', species='eevee')
+
+
+def test_move_pool_is_limited_to_the_version_group():
+    """Moves learned in other version groups are not in the pool."""
+    move_pool = _database.get_move_pool(species='eevee', move_method='level-up')
+    assert len(move_pool) == len({x.move.identifier for x in move_pool})
+
+
+def test_measure_counts_calls_and_statements():
+    """Scoped measurement records calls, statements, and times."""
+    _database.clear_cache()
+    with _database.measure() as collector:
+        _database.get_pokemon(species='eevee')
+        _database.get_pokemon(species='eevee')
+    stats = collector.stats()['get_pokemon']
+    assert 2 == stats.calls
+    assert 1 <= stats.statements
+    assert 0 < stats.p50 <= stats.p99 <= stats.max_time <= stats.total_time
+    # The second call is a cache hit.
+    with _database.measure() as collector:
+        _database.get_pokemon(species='eevee')
+    assert 0 == collector.stats()['get_pokemon'].statements
+
+
+def test_instrumentation_is_opt_in():
+    _database.reset_instrumentation()
+    _database.get_pokemon(species='eevee')
+    assert {} == _database.instrumentation_stats()
+    _database.enable_instrumentation()
+    try:
+        _database.get_experience(species='eevee', level=5)
+    finally:
+        _database.disable_instrumentation()
+    _database.get_experience(species='eevee', level=5)
+    stats = _database.instrumentation_stats()
+    assert 1 == stats['get_experience'].calls
+    # Nested helpers are recorded as well.
+    assert 'get_experience_curve' in stats
+    _database.reset_instrumentation()
+
+
+def test_warmup_prevents_lazy_loads():
+    """The relationships walked by ``Pokemon`` are loaded up front."""
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    with _database.session_scope() as session:
+        _database.warmup(species=['eevee'])
+        pokemon = session.query(_database.pokedex.db.tables.Pokemon).get(133)
+        engine = session.get_bind()
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', count)
+        try:
+            assert pokemon.species.gender_rate is not None
+            assert [type_.identifier for type_ in pokemon.types]
+            assert 6 == len([stat.base_stat for stat in pokemon.stats])
+            assert [ability.identifier for ability in pokemon.abilities]
+            for item in pokemon.items:
+                assert item.item.identifier
+            for child in pokemon.species.child_species:
+                evolution = child.evolutions[0]
+                assert evolution.trigger.identifier
+                evolution.held_item, evolution.known_move
+        finally:
+            sqlalchemy.event.remove(engine, 'before_cursor_execute', count)
+    assert [] == statements
+
+
+def test_ensure_indexes():
+    _database.ensure_indexes()
+    assert [] == _database.missing_indexes()
+
+
+def test_measure_pokemon_creation():
+    """The example of ``measure()``."""
+    from pokemaster.pokemon import Pokemon
+
+    with _database.measure() as collector:
+        Pokemon('eevee', level=5)
+    assert 6 == collector.stats()['get_pokemon'].calls
+
+
+def test_many_threads_query_at_once():
+    """More threads than the default pool size (5 + 10 overflow) can
+    hold a session at once."""
+    _database.set_session(_database.get_session())
+    barrier = threading.Barrier(20, timeout=10)
+
+    def work(_):
+        species = _database.get_pokemon(national_id=133).identifier
+        barrier.wait()
+        _database.close_session()
+        return species
+
+    with ThreadPoolExecutor(20) as executor:
+        assert ['eevee'] * 20 == list(executor.map(work, range(20)))
@@ -0,0 +1,132 @@
+"""Tests for `pokemaster._datapack`."""
+import pytest
+from sqlalchemy.orm.exc import NoResultFound
+
+from pokemaster import _database
+from pokemaster._datapack import FORMAT_VERSION, DataPack, pack_snapshot
+
+
+@pytest.fixture(scope='module')
+def pack_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('datapack') / 'pokedex.pack'
+    _database.export_datapack(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def datapack(pack_path):
+    """Serve the query helpers from a data pack for a test."""
+    yield _database.load_datapack(pack_path)
+    _database.drop_snapshot()
+
+
+def answers():
+    return (
+        _database.get_pokemon(national_id=386).identifier,
+        _database.get_pokemon(species='castform', form='rainy').identifier,
+        [
+            stat.base_stat
+            for stat in _database.get_pokemon(species='eevee').stats
+        ],
+        _database.get_experience(species='eevee', exp=2000).level,
+        _database.get_nature(personality=0x7E482751).identifier,
+        _database.get_ability(species='nidorina', personality=1).identifier,
+        _database.get_pokemon_gender(
+            species='nidorina', personality=0
+        ).identifier,
+        [
+            move.identifier
+            for move in _database.get_pokemon_default_moves(
+                level=42, species='eevee'
+            )
+        ],
+        _database.can_learn_move(
+            'toxic', species='eevee', move_method='machine'
+        ),
+        _database.get_machine(108).move_id,
+        _database.get_machine(move_identifier='toxic').machine_number,
+    )
+
+
+def test_datapack_matches_database(datapack):
+    """Every helper gives the same answers from the data pack."""
+    from_pack = answers()
+    _database.drop_snapshot()
+    assert answers() == from_pack
+
+
+def test_datapack_evolution_chain(datapack):
+    """Species records are linked to their evolutions."""
+    eevee = _database.get_pokemon(species='eevee').species
+    assert 'vaporeon' in {child.identifier for child in eevee.child_species}
+    assert eevee is _database.get_pokemon(species='eevee').species
+    vaporeon = _database.get_pokemon(species='vaporeon').species
+    assert vaporeon in eevee.child_species
+
+
+def test_datapack_species_stats(datapack):
+    from_pack = _database.get_species_stats()
+    _database.drop_snapshot()
+    from_database = _database.get_species_stats()
+    assert from_database.national_ids == from_pack.national_ids
+    assert from_database.base_stats == from_pack.base_stats
+    assert from_database.effort == from_pack.effort
+
+
+def test_datapack_get_move(datapack):
+    """The data pack finds the same moves as the database, which are
+    those of generations 1 to 3."""
+
+    def lookups():
+        found = []
+        for move, move_id in [
+            ('focus-punch', None),
+            (None, 291),
+            ('tackle', None),
+            (None, 226),
+            ('shadow-claw', None),
+        ]:
+            try:
+                found.append(_database.get_move(move, move_id).identifier)
+            except NoResultFound:
+                found.append(None)
+        return found
+
+    from_pack = lookups()
+    _database.drop_snapshot()
+    assert lookups() == from_pack
+    assert ['focus-punch', 'dive', 'tackle', 'baton-pass', None] == from_pack
+
+
+def test_datapack_missing_rows(datapack):
+    with pytest.raises(NoResultFound):
+        _database.get_pokemon(species='missingno')
+    with pytest.raises(NoResultFound):
+        _database.get_move(move='not-a-move')
+    assert _database.get_machine(move_identifier='not-a-move') is None
+
+
+def test_datapack_version(tmp_path):
+    """Packs of another format version are refused."""
+    data = bytearray(
+        pack_snapshot(_database.Snapshot.from_session(_database.get_session()))
+    )
+    data[8:10] = (FORMAT_VERSION + 1).to_bytes(2, 'little')
+    path = tmp_path / 'future.pack'
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        DataPack(str(path))
+
+
+def test_reloading_closes_datapack(pack_path):
+    """A replaced or dropped data pack is unmapped."""
+    first = _database.load_datapack(pack_path)
+    eevee = _database.get_pokemon(species='eevee')
+    second = _database.load_datapack(pack_path)
+    try:
+        assert first._mmap.closed
+        assert not second._mmap.closed
+        assert 'eevee' == eevee.identifier
+    finally:
+        _database.drop_snapshot()
+    assert second._mmap.closed
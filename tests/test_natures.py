@@ -0,0 +1,67 @@
+"""Tests for `pokemaster.natures`."""
+import pokedex.db.tables
+import pytest
+from sqlalchemy.orm.exc import NoResultFound
+
+from pokemaster import _database, natures
+from pokemaster.stats import Stats
+
+
+def test_records_match_database():
+    """The constant table agrees with the pokedex ``natures`` table."""
+    rows = _database.get_session().query(pokedex.db.tables.Nature).all()
+    assert len(natures.RECORDS) == len(rows)
+    for row in rows:
+        record = natures.RECORDS[row.game_index]
+        assert (row.id, row.identifier, row.is_neutral) == (
+            record.id,
+            record.identifier,
+            record.is_neutral,
+        )
+        assert row.increased_stat.id == record.increased_stat.id
+        assert row.decreased_stat.identifier == record.decreased_stat.identifier
+
+
+def test_record_ids():
+    """The IDs are the pokedex ones, not alphabetical."""
+    assert [1, 2, 3, 4, 5, 6] == [
+        natures.get_nature(identifier=identifier).id
+        for identifier in ('hardy', 'bold', 'modest', 'calm', 'timid', 'lonely')
+    ]
+    assert 25 == natures.get_nature(identifier='serious').id
+    assert list(range(1, 26)) == sorted(natures.IDS)
+
+
+def test_get_nature():
+    assert 'adamant' == natures.get_nature(3).identifier
+    assert 3 == natures.get_nature(identifier='adamant').game_index
+    assert 'attack' == natures.get_nature(3).increased_stat.identifier
+    with pytest.raises(NoResultFound):
+        natures.get_nature(identifier='grumpy')
+    with pytest.raises(NoResultFound):
+        natures.get_nature(4, identifier='adamant')
+
+
+def test_get_nature_does_not_query():
+    with _database.measure() as collector:
+        assert 'careful' == _database.get_nature(0x7E482751).identifier
+        _database.get_nature_many(range(100))
+    assert {0} == {stats.statements for stats in collector.stats().values()}
+
+
+def test_nature_modifiers():
+    assert Stats(1, 1.1, 1, 0.9, 1, 1) == Stats.make_nature_modifiers('adamant')
+    assert Stats(1, 1, 1, 1, 1, 1) == Stats.make_nature_modifiers('hardy')
+    assert Stats(1, 1, 0.9, 1, 1, 1.1) == Stats.make_nature_modifiers('hasty')
+    with pytest.raises(NoResultFound):
+        Stats.make_nature_modifiers('grumpy')
+
+
+def test_modifier_array():
+    np = pytest.importorskip('numpy')
+    array = natures.modifier_array()
+    assert (25, 6) == array.shape
+    assert natures.MODIFIERS[13] == tuple(array[13].tolist())
+    personalities = np.array([0x7E482751, 3])
+    assert [1.0, 1.1] == array[personalities % 25, 1].tolist()
+    assert [0.9, 0.9] == array[personalities % 25, 3].tolist()
@@ -1,7 +1,10 @@
 """Tests for `pokemaster.Pokemon`."""
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from pokemaster.pokemon import Pokemon
+from pokemaster.stats import Stats
 
 
 @pytest.fixture
@@ -88,6 +91,14 @@ def test_pokemon_level_up():
     assert 6 == bulbasaur.level
 
 
+def test_pokemon_level_up_to_100():
+    """A Pokémon can gain multiple levels at once."""
+    eevee = Pokemon(species='eevee', level=5)
+    eevee.gain_exp(earned_exp=1000000 - eevee.exp)
+    assert 100 == eevee.level
+    assert 1000000 == eevee.exp
+
+
 def test_pokemon_evolution_by_level_up():
     """A Pokémon have the ability to evolve when it attains to a certain
     level."""
@@ -97,6 +108,32 @@ def test_pokemon_evolution_by_level_up():
     assert 2 == bulbasaur.national_id
 
 
+def test_create_pokemon_in_threads():
+    """``Pokemon`` instances can be created from multiple threads."""
+
+    def eevee_moves(_):
+        return Pokemon(species='eevee', level=42).moves
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        moves = list(executor.map(eevee_moves, range(32)))
+    assert 32 * [['quick-attack', 'bite', 'baton-pass', 'take-down']] == moves
+
+
+def test_create_pokemon_with_prng():
+    """A ``Pokemon`` draws its personality and IV's from the given
+    generator."""
+    from pokemaster.prng import PRNG
+
+    eevee = Pokemon(species='eevee', level=5, prng=PRNG(0x1A56B091))
+    again = Pokemon(species='eevee', level=5, prng=PRNG(0x1A56B091))
+    assert eevee.nature == again.nature
+    assert eevee.stats == again.stats
+    prng = PRNG(0x1A56B091)
+    gene = prng.create_gene()
+    assert Stats.make_iv(gene) == eevee._iv
+    assert prng.create_personality() == eevee._personality
+
+
 def test_pokemon_default_moves():
     """A ``Pokemon`` will always know the last 4 moves it learned by
     level- up."""
@@ -5,7 +5,7 @@ https://www.smogon.com/ingame/rng/pid_iv_creation#pokemon_random_number_generato
 """
 import pytest
 
-from pokemaster.prng import PRNG
+from pokemaster.prng import PRNG, PRNG64, MersenneTwister, for_generation
 
 
 def test_prng_default_seed_is_0():
@@ -44,3 +44,143 @@ def test_uniform():
     assert prng.uniform(5, 10) == 5 * 0x5233 / 0x10000 + 5
     with pytest.raises(ValueError):
         prng.uniform(10, 5)
+
+
+@pytest.mark.parametrize('n', [0, 1, 5, 4096, 10000])
+def test_next_array_matches_scalar_stream(n):
+    np = pytest.importorskip('numpy')
+    batch, scalar = PRNG(0x1A56B091), PRNG(0x1A56B091)
+    values = batch.next_array(n)
+    assert np.uint16 == values.dtype
+    assert [scalar() for _ in range(n)] == values.tolist()
+    # Both generators are left in the same state.
+    assert scalar() == batch()
+
+
+def test_next_seeds():
+    np = pytest.importorskip('numpy')
+    seeds = PRNG(0x1A56B091).next_seeds(2)
+    assert np.uint32 == seeds.dtype
+    assert [0x01DB, 0x7B06] == (seeds >> 16).tolist()
+
+
+def test_advance_and_rewind():
+    prng, stepped = PRNG(0x1A56B091), PRNG(0x1A56B091)
+    stepped.next(1000)
+    prng.advance(1000)
+    assert stepped.seed == prng.seed
+    prng.rewind(1000)
+    assert 0x1A56B091 == prng.seed
+    prng.advance(-4)
+    prng.advance(4)
+    assert 0x1A56B091 == prng.seed
+
+
+def test_advance_far():
+    prng = PRNG(0x1A56B091)
+    prng.advance(10**9)
+    assert 10**9 == prng.distance(0x1A56B091, prng.seed)
+    # The generator has a period of 2 ** 32.
+    prng.advance(2**32 - 10**9)
+    assert 0x1A56B091 == prng.seed
+
+
+def test_distance():
+    prng = PRNG(0x1A56B091)
+    assert 0 == prng.distance(prng.seed, prng.seed)
+    prng.next(5)
+    assert 5 == prng.distance(0x1A56B091, prng.seed)
+    assert 2**32 - 5 == prng.distance(prng.seed, 0x1A56B091)
+
+
+def test_unsupported_generation():
+    prng = PRNG(gen=2)
+    with pytest.raises(ValueError):
+        prng()
+    with pytest.raises(ValueError):
+        prng.next(3)
+
+
+def test_substreams_do_not_overlap():
+    prng = PRNG(0x1A56B091)
+    first, second = prng.split(2, length=100)
+    assert 0x1A56B091 == prng.seed
+    assert second.next(3) == prng.substream(1, length=100).next(3)
+    second.reset()
+    assert first.next(100) + second.next(100) == prng.next(200)
+    with pytest.raises(ValueError):
+        prng.substream(2**32 // 100, length=100)
+
+
+def test_prng_factory():
+    import pickle
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pokemaster.prng import PRNGFactory
+
+    factory = pickle.loads(pickle.dumps(PRNGFactory(seed=0x1A56B091)))
+    assert 4096 == len(factory)
+
+    def genomes(index):
+        prng = factory(index)
+        return [prng.create_genome() for _ in range(10)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sharded = list(executor.map(genomes, range(16)))
+    assert [genomes(index) for index in range(16)] == sharded
+    assert PRNG(0x1A56B091).create_genome() == sharded[0][0]
+
+
+def test_gen_4_shares_the_gen_3_lcg():
+    assert PRNG(0x1A56B091).next(5) == PRNG(0x1A56B091, gen=4).next(5)
+    assert MersenneTwister(0x1A56B091).next(3) == (
+        PRNG(0x1A56B091, gen=4).twister().next(3)
+    )
+    with pytest.raises(ValueError, match='PRNG64'):
+        PRNG(gen=5)()
+
+
+def test_prng64():
+    prng = PRNG64(0x1A56B091)
+    seed = (0x5D588B656C078965 * 0x1A56B091 + 0x269EC3) % 2**64
+    assert seed >> 32 == prng()
+    assert seed == prng.seed
+    numbers = prng.next(1000)
+    prng.rewind(1001)
+    assert 0x1A56B091 == prng.seed
+    prng.advance(1001)
+    assert 1001 == prng.distance(0x1A56B091, prng.seed)
+    assert numbers[-1] == prng.seed >> 32
+    assert 0 <= prng.random() < 1
+    assert isinstance(for_generation(5), PRNG64)
+
+
+def test_prng64_next_array():
+    np = pytest.importorskip('numpy')
+    prng, scalar = PRNG64(0x1A56B091), PRNG64(0x1A56B091)
+    assert scalar.next(5000) == prng.next_array(5000).tolist()
+    assert np.uint32 == prng.next_array(1).dtype
+    scalar()
+    assert scalar.seed == prng.seed
+
+
+def test_mersenne_twister():
+    # The reference outputs of MT19937 seeded with 5489.
+    mt = MersenneTwister(5489)
+    assert [3499211612, 581869302, 3890346734] == mt.next(3)
+    numbers = mt.next(2000)
+    mt.reset()
+    mt.advance(1003)
+    assert numbers[1000] == mt()
+    with pytest.raises(ValueError):
+        mt.advance(-1)
+    assert all(0 <= iv < 32 for iv in mt.create_ivs())
+
+
+def test_mersenne_twister_next_array():
+    pytest.importorskip('numpy')
+    mt = MersenneTwister(0x1A56B091)
+    array = mt.next_array(1500)
+    mt.reset()
+    assert mt.next(1500) == array.tolist()
+    assert [] == mt.next_array(0).tolist()
@@ -0,0 +1,92 @@
+"""Tests for `pokemaster._provision`."""
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import sqlalchemy
+
+from pokemaster import _database, _provision
+
+
+def test_load_csv(tmp_path):
+    """The CSV files are loaded, and the indexes created afterwards."""
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    (csv_dir / 'genders.csv').write_text('id,identifier\n1,female\n2,male\n')
+    uri = f'sqlite:///{tmp_path / "pokedex.sqlite"}'
+    assert _provision.provision(uri, csv_dir=str(csv_dir))
+
+    connection = sqlite3.connect(str(tmp_path / 'pokedex.sqlite'))
+    try:
+        assert [(1, 'female'), (2, 'male')] == connection.execute(
+            'SELECT id, identifier FROM genders ORDER BY id'
+        ).fetchall()
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+    finally:
+        connection.close()
+    tables = _database.pokedex.db.tables.metadata.sorted_tables
+    assert sum(len(table.indexes) for table in tables) <= len(indexes)
+
+
+def test_provision_is_idempotent(tmp_path):
+    prebuilt = _provision.sqlite_path(str(_database._session().bind.url))
+    uri = f'sqlite:///{tmp_path / "pokedex.sqlite"}'
+    assert _provision.provision(uri, prebuilt=prebuilt)
+    assert not _provision.provision(uri, prebuilt=prebuilt)
+    assert _provision.is_provisioned(str(tmp_path / 'pokedex.sqlite'))
+
+
+@pytest.mark.parametrize(
+    'name', ['poke?dex.sqlite', 'poke#dex.sqlite', '%3F.sqlite']
+)
+def test_is_provisioned_quotes_path(tmp_path, name):
+    """Paths are not taken for URIs."""
+    prebuilt = _provision.sqlite_path(str(_database._session().bind.url))
+    path = tmp_path / name
+    assert not _provision.is_provisioned(str(path))
+    shutil.copyfile(prebuilt, str(path))
+    assert _provision.is_provisioned(str(path))
+
+
+def test_concurrent_provisioning(tmp_path):
+    """Only one of many concurrent callers builds the database."""
+    prebuilt = _provision.sqlite_path(str(_database._session().bind.url))
+    uri = f'sqlite:///{tmp_path / "pokedex.sqlite"}'
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        built = list(
+            executor.map(
+                lambda _: _provision.provision(uri, prebuilt=prebuilt),
+                range(8),
+            )
+        )
+    assert 1 == built.count(True)
+    assert [] == list(tmp_path.glob('*.tmp'))
+
+
+def test_provision_requires_sqlite_file():
+    with pytest.raises(ValueError):
+        _provision.provision('sqlite://')
+
+
+def test_ensure_indexes(tmp_path):
+    """The learnset query becomes an index-only lookup."""
+    path = tmp_path / 'pokedex.sqlite'
+    prebuilt = _provision.sqlite_path(str(_database._session().bind.url))
+    _provision.provision(f'sqlite:///{path}', prebuilt=prebuilt)
+    engine = sqlalchemy.create_engine(f'sqlite:///{path}')
+    for spec in _provision.INDEXES:
+        engine.execute(f'DROP INDEX IF EXISTS {spec.name}')
+    assert list(_provision.INDEXES) == _provision.missing_indexes(engine)
+
+    assert list(_provision.INDEXES) == _provision.ensure_indexes(engine)
+    assert [] == _provision.missing_indexes(engine)
+    assert [] == _provision.ensure_indexes(engine)
+    plan = engine.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM pokemon_moves '
+        'WHERE pokemon_id = 133 AND version_group_id = 6'
+    ).fetchall()
+    assert 'COVERING INDEX ix_pokemaster_pokemon_moves' in str(plan)
+    engine.dispose()
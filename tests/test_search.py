@@ -0,0 +1,99 @@
+"""Tests for `pokemaster.search`."""
+import pytest
+
+from pokemaster.prng import PRNG
+from pokemaster.stats import Stats
+
+np = pytest.importorskip('numpy')
+
+from pokemaster.search import (  # noqa: E402
+    Criteria,
+    Match,
+    recover_seeds,
+    search,
+)
+
+
+def brute_force(criteria, seeds, frames, method):
+    matches = []
+    for seed in seeds:
+        prng = PRNG(seed)
+        prng.advance(frames.start)
+        for frame in frames:
+            pid, gene = PRNG(prng.seed).create_genome(method)
+            if criteria.matches(pid, gene):
+                matches.append(Match(seed, frame, method, pid, gene))
+            prng()
+    return matches
+
+
+def test_criteria():
+    pid, gene = PRNG(0x560B9CE3).create_genome(2)
+    iv = Stats.make_iv(gene)
+    assert Criteria().matches(pid, gene)
+    assert Criteria(natures={'careful'}).matches(pid, gene)
+    assert not Criteria(natures={'adamant'}).matches(pid, gene)
+    assert Criteria(ivs={'attack': iv.attack}).matches(pid, gene)
+    assert not Criteria(ivs={'attack': (iv.attack + 1, 31)}).matches(pid, gene)
+    assert Criteria(ability=pid & 1).matches(pid, gene)
+    assert not Criteria(ability=(pid & 1) ^ 1).matches(pid, gene)
+    shiny_id = (pid >> 16) ^ (pid & 0xFFFF)
+    assert Criteria(shiny=True, trainer_id=shiny_id).matches(pid, gene)
+    assert not Criteria(shiny=True, trainer_id=shiny_id ^ 8).matches(pid, gene)
+    with pytest.raises(ValueError):
+        Criteria(natures={'grumpy'})
+    with pytest.raises(ValueError):
+        Criteria(ivs={'luck': 31})
+
+
+@pytest.mark.parametrize('method', [1, 2, 4])
+def test_search_frames(method):
+    criteria = Criteria(natures={'adamant', 'jolly'}, ivs={'speed': (20, 31)})
+    frames = range(100, 3000)
+    expected = brute_force(criteria, [0x1A56B091], frames, method)
+    assert expected
+    assert (
+        list(search(criteria, [0x1A56B091], frames, method, processes=1))
+        == expected
+    )
+
+
+@pytest.mark.parametrize('method', [1, 2, 4])
+def test_search_seeds(method):
+    criteria = Criteria(natures={'modest'}, ivs={'special_attack': (25, 31)})
+    seeds, frames = range(1000, 1600), range(3, 6)
+    expected = brute_force(criteria, seeds, frames, method)
+    assert expected
+    found = search(criteria, seeds, frames, method, processes=1)
+    assert sorted(found, key=lambda m: (m.seed, m.frame)) == expected
+
+
+def test_search_processes(monkeypatch):
+    """Matches are streamed from the worker processes."""
+    monkeypatch.setattr('pokemaster.search.CHUNK_SIZE', 200)
+    criteria = Criteria(natures={'timid'})
+    seeds = range(0, 2000)
+    expected = brute_force(criteria, seeds, range(1), 2)
+    found = search(criteria, seeds, processes=2)
+    assert sorted(found, key=lambda m: m.seed) == expected
+
+
+def test_recover_seeds():
+    pid, gene = PRNG(0x560B9CE3).create_genome(2)
+    matches = recover_seeds(Stats.make_iv(gene), method=2)
+    assert Match(0x560B9CE3, 0, 2, pid, gene) in matches
+    for match in matches:
+        assert match.iv == Stats.make_iv(gene)
+        assert PRNG(match.seed).create_genome(2) == (match.pid, match.gene)
+    careful = recover_seeds(
+        Stats.make_iv(gene), criteria=Criteria(natures={'careful'})
+    )
+    assert {match.nature for match in careful} == {'careful'}
+    assert len(careful) < len(matches)
+
+
+@pytest.mark.parametrize('method', [1, 4])
+def test_recover_seeds_methods(method):
+    pid, gene = PRNG(0xDEADBEEF).create_genome(method)
+    matches = recover_seeds(Stats.make_iv(gene), method=method)
+    assert Match(0xDEADBEEF, 0, method, pid, gene) in matches
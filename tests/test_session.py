@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
+import gc
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import weakref
 from pathlib import Path
 
 import pokedex.db.tables
 import pokedex.defaults
 import pytest
+import sqlalchemy.exc
+import sqlalchemy.orm
+import sqlalchemy.pool
 
+import pokemaster
+from pokemaster import _database
 from pokemaster._database import get_session
 
 
@@ -33,3 +45,84 @@ def test_set_up_db_if_db_is_empty():
     # Should populate the db.
     session = get_session()
     assert pokedex.db.tables.Pokemon.__table__.exists(session.bind)
+
+
+def test_importing_does_not_connect():
+    """The database is not touched until the first query."""
+    code = 'from pokemaster import _database; print(_database.SESSION)'
+    output = subprocess.run(
+        [sys.executable, '-c', code], stdout=subprocess.PIPE, check=True
+    ).stdout
+    assert b'None' == output.strip()
+
+
+def test_connect_binds_session():
+    session = pokemaster.connect()
+    assert _database.SESSION is session
+
+
+def test_read_only_session():
+    uri = str(_database._session().bind.url)
+    session = get_session(uri, read_only=True)
+    assert 1 == session.execute('PRAGMA query_only').scalar()
+    assert 0 < session.execute('PRAGMA mmap_size').scalar()
+    assert session.query(pokedex.db.tables.Pokemon).count()
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        session.execute('CREATE TABLE scratch (id INTEGER)')
+    session.remove()
+
+
+def _species_in_child(national_id):
+    return _database.get_pokemon(national_id=national_id).species.identifier
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork() is not available.')
+def test_session_after_fork():
+    """Forked workers open their own connections."""
+    session = _database.get_session()
+    _database.set_session(session)
+    _database.get_pokemon(national_id=1)
+    context = multiprocessing.get_context('fork')
+    with context.Pool(2) as pool:
+        assert ['bulbasaur', 'eevee'] == pool.map(_species_in_child, [1, 133])
+    _database.clear_cache()
+    assert 'bulbasaur' == _species_in_child(1)
+
+
+def test_sessions_of_finished_threads_are_released():
+    """The query caches do not keep a thread's session, nor its pooled
+    connection, alive."""
+    uri = str(_database._session().bind.url)
+    engine = sqlalchemy.create_engine(
+        uri,
+        poolclass=sqlalchemy.pool.QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=1,
+        connect_args={'check_same_thread': False},
+    )
+    session = sqlalchemy.orm.scoped_session(
+        sqlalchemy.orm.sessionmaker(bind=engine)
+    )
+    _database.set_session(session)
+    sessions, errors = [], []
+
+    def work():
+        try:
+            _database.get_pokemon(species='eevee')
+            sessions.append(weakref.ref(_database._session()))
+            _database.close_session()
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    try:
+        for _ in range(3):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        gc.collect()
+        assert [] == errors
+        assert [None] * 3 == [ref() for ref in sessions]
+    finally:
+        _database.set_session(_database.get_session(uri))
+        engine.dispose()
@@ -1,4 +1,9 @@
 """Tests for ``pokemaster.stats``."""
+import pickle
+
+import pytest
+from sqlalchemy.orm.exc import NoResultFound
+
 from pokemaster.stats import BattleStats, Stats
 
 
@@ -35,3 +40,157 @@ def test_create_default_battle_stats():
     assert 4 == battle_stats.special_attack
     assert 5 == battle_stats.special_defense
     assert 6 == battle_stats.speed
+
+
+def test_stats_are_immutable_tuples():
+    stats = Stats(1, 2, 3, 4, 5, 6)
+    assert (1, 2, 3, 4, 5, 6) == tuple(stats)
+    assert 4 == stats.special_attack
+    with pytest.raises(AttributeError):
+        stats.hp = 2
+    assert stats == pickle.loads(pickle.dumps(stats))
+    assert 'Stats(hp=1, attack=2' in repr(stats)
+
+
+def test_stats_checks_types():
+    with pytest.raises(TypeError):
+        Stats(hp='1')
+    with pytest.raises(TypeError):
+        Stats() + (1, 2, 3, 4, 5, 6)
+    with pytest.raises(TypeError):
+        (1, 2, 3, 4, 5, 6) + Stats()
+    assert Stats._make(range(6)) == Stats(0, 1, 2, 3, 4, 5)
+
+
+def test_make_permanent_stats():
+    """The fused formula gives the same stats as the operators."""
+    base = Stats(55, 55, 50, 45, 65, 55)
+    iv = Stats.make_iv(0x5EE9629C)
+    ev = Stats(4, 252, 0, 0, 0, 252)
+    modifiers = Stats(1, 1.1, 1, 0.9, 1, 1)
+    residual = Stats(10 + 42, 5, 5, 5, 5, 5)
+    expected = ((base * 2 + iv + ev // 4) * 42 // 100 + residual) * modifiers
+    assert expected == Stats.make_permanent_stats(base, iv, ev, 42, modifiers)
+
+
+def test_make_permanent_stats_base_hp_1():
+    """Shedinja always has 1 HP."""
+    stats = Stats.make_permanent_stats(
+        Stats(1, 90, 45, 30, 30, 40),
+        Stats(31, 0, 0, 0, 0, 0),
+        Stats(),
+        50,
+        Stats(1, 1, 1, 1, 1, 1),
+    )
+    assert 1 == stats.hp
+
+
+def test_stats_array_operators():
+    np = pytest.importorskip('numpy')
+    from pokemaster.stats import StatsArray
+
+    array = StatsArray([[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]])
+    stats = Stats(1, 1, 1, 1, 1, 1)
+    assert [Stats(2, 3, 4, 5, 6, 7), Stats(8, 9, 10, 11, 12, 13)] == (
+        array + stats
+    ).to_stats()
+    assert stats + array == array + 1
+    assert 2 * array == array + array
+    assert (array - array).to_stats() == [Stats(), Stats()]
+    assert Stats(0, 1, 1, 2, 2, 3) == (array // 2)[0]
+    assert [Stats(0, -1, -2, -3, -4, -5), Stats(-6, -7, -8, -9, -10, -11)] == (
+        stats - array
+    ).to_stats()
+    assert [Stats(12, 6, 4, 3, 2, 2), Stats(1, 1, 1, 1, 1, 1)] == (
+        Stats(12, 12, 12, 12, 12, 12) // array
+    ).to_stats()
+    assert 13 - array == Stats(13, 13, 13, 13, 13, 13) - array
+    assert 12 // array == Stats(12, 12, 12, 12, 12, 12) // array
+    with pytest.raises(TypeError):
+        array + 'a'
+    with pytest.raises(ValueError):
+        StatsArray(np.zeros((2, 5)))
+
+
+def test_stats_array_views():
+    np = pytest.importorskip('numpy')
+    from pokemaster.stats import StatsArray
+
+    data = np.arange(12).reshape(2, 6)
+    array = StatsArray(data)
+    assert np.shares_memory(data, np.asarray(array))
+    assert np.shares_memory(data, array.speed)
+    assert np.shares_memory(data, array[1:].array)
+    assert [5, 11] == array.speed.tolist()
+    assert Stats(6, 7, 8, 9, 10, 11) == array[1]
+    assert list(array) == array.to_stats()
+    assert StatsArray.from_stats(array) == array
+
+
+def test_stats_array_make_iv():
+    np = pytest.importorskip('numpy')
+    from pokemaster.stats import StatsArray
+
+    genes = [0x5EE9629C, 0x00FF, 0xFFFFFFFF]
+    ivs = StatsArray.make_iv(np.array(genes, dtype=np.uint32))
+    assert [Stats.make_iv(gene) for gene in genes] == ivs.to_stats()
+
+
+def test_stats_array_make_permanent_stats():
+    """The vectorized formula agrees with ``Stats`` row by row."""
+    np = pytest.importorskip('numpy')
+    from pokemaster.stats import StatsArray
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(1, 256, size=(500, 6))
+    base[::7, 0] = 1
+    iv = rng.integers(0, 32, size=(500, 6))
+    ev = rng.integers(0, 256, size=(500, 6))
+    level = rng.integers(1, 101, size=500)
+    modifiers = Stats(1, 1.1, 1, 0.9, 1, 1)
+    stats = StatsArray.make_permanent_stats(
+        StatsArray(base), StatsArray(iv), StatsArray(ev), level, modifiers
+    )
+    assert [
+        Stats.make_permanent_stats(
+            Stats._make(b), Stats._make(i), Stats._make(e), l, modifiers
+        )
+        for b, i, e, l in zip(
+            base.tolist(), iv.tolist(), ev.tolist(), level.tolist()
+        )
+    ] == stats.to_stats()
+
+    # One species at every level.
+    levels = StatsArray.make_permanent_stats(
+        Stats(1, 90, 45, 30, 30, 40), Stats(), Stats(), np.arange(1, 101), 1
+    )
+    assert 100 == len(levels)
+    assert {1} == set(levels.hp.tolist())
+
+
+def test_make_species_strengths():
+    assert Stats(55, 55, 50, 45, 65, 55) == Stats.make_species_strengths(
+        'eevee'
+    )
+    assert Stats.make_species_strengths('eevee') == (
+        Stats.make_species_strengths(national_id=133)
+    )
+    eevee = Stats.make_ev_yield('eevee')
+    assert Stats(0, 0, 0, 0, 1, 0) == eevee
+
+
+def test_stats_array_species_lookup():
+    np = pytest.importorskip('numpy')
+    from pokemaster.stats import StatsArray
+
+    national_ids = np.array([133, 1, 133])
+    assert [
+        Stats.make_species_strengths(national_id=national_id)
+        for national_id in national_ids.tolist()
+    ] == StatsArray.make_species_strengths(national_ids).to_stats()
+    assert [
+        Stats.make_ev_yield(national_id=national_id)
+        for national_id in national_ids.tolist()
+    ] == StatsArray.make_ev_yield(national_ids).to_stats()
+    with pytest.raises(NoResultFound):
+        StatsArray.make_species_strengths(np.array([0, 100000, -1]))